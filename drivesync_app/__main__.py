@@ -0,0 +1,5 @@
+"""Permite executar o DriveSync com `python -m drivesync_app`."""
+
+from drivesync_app.main import main
+
+main()
@@ -3,17 +3,253 @@
 import os
 import logging
 import configparser
+import datetime
+import threading
+import httplib2
+import google_auth_httplib2
 from google.auth.transport.requests import Request as GoogleAuthRequest
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
 from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
 
+try:
+    import orjson
+except ImportError:  # Dependência opcional: sem ela, as respostas são decodificadas com o módulo json padrão
+    orjson = None
+
 # Escopo para acesso completo ao Google Drive
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
 logger = logging.getLogger(__name__)
 
+# Raiz do projeto (um nível acima deste pacote), base dos caminhos relativos do config.ini
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Timeout padrão (em segundos) do transporte HTTP compartilhado
+DEFAULT_HTTP_TIMEOUT = 60
+
+# Margem antes da expiração a partir da qual o token é considerado "velho"
+# e uma atualização em segundo plano é disparada.
+REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+# Cache de serviços já construídos, indexado por (client_secret_file_path, token_file_path, escopos).
+# Cada entrada guarda a tupla (service, RefreshingCredentials) para que chamadas
+# repetidas evitem reler arquivos, reconstruir as credenciais e chamar build() novamente.
+_SERVICE_CACHE = {}
+_SERVICE_CACHE_LOCK = threading.Lock()
+
+# Credenciais já lidas do disco, indexadas pelo caminho do arquivo de token:
+# path -> (st_mtime_ns, st_size, Credentials). O arquivo só é relido e
+# reinterpretado quando sua assinatura de stat muda.
+_TOKEN_STAT_CACHE = {}
+_TOKEN_STAT_CACHE_LOCK = threading.Lock()
+
+
+def _utcnow():
+    """Retorna o instante atual em UTC sem tzinfo, como `Credentials.expiry`."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def build_authorized_http(creds, timeout=DEFAULT_HTTP_TIMEOUT):
+    """
+    Cria um transporte HTTP autorizado com conexões keep-alive reutilizáveis.
+
+    Todas as requisições feitas por um serviço construído com este transporte
+    (listagens, criações, uploads e `next_chunk`) reaproveitam as mesmas conexões
+    TCP+TLS, evitando um novo handshake a cada chamada.
+
+    Args:
+        creds (google.oauth2.credentials.Credentials): Credenciais do usuário.
+        timeout (int): Timeout de socket em segundos.
+
+    Returns:
+        google_auth_httplib2.AuthorizedHttp: Transporte que injeta e atualiza o token.
+    """
+    return google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=timeout))
+
+
+class OrjsonModel(JsonModel):
+    """
+    Modelo de resposta da API que decodifica o corpo JSON com `orjson`.
+
+    O `JsonModel` padrão usa `json.loads`, que domina o tempo de CPU ao listar
+    pastas com milhares de itens. Conteúdos que o orjson não consegue interpretar
+    são repassados ao comportamento original.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+def _response_model():
+    """Retorna o modelo de resposta a usar no `build()`: `OrjsonModel` se o orjson estiver instalado, senão None (padrão)."""
+    if orjson is None:
+        return None
+    return OrjsonModel()
+
+
+def _remember_token_stat(token_file_path, creds):
+    """Associa as credenciais à assinatura de stat atual do arquivo de token."""
+    try:
+        stat_info = os.stat(token_file_path)
+    except OSError:
+        return
+    with _TOKEN_STAT_CACHE_LOCK:
+        _TOKEN_STAT_CACHE[token_file_path] = (stat_info.st_mtime_ns, stat_info.st_size, creds)
+
+
+def _load_token_credentials(token_file_path):
+    """
+    Carrega as credenciais do arquivo de token, reutilizando a última leitura se o arquivo não mudou.
+
+    A comparação usa (st_mtime_ns, st_size) do arquivo; se forem iguais aos da
+    última leitura, o objeto `Credentials` já construído é devolvido sem abrir
+    nem interpretar o JSON novamente.
+
+    Returns:
+        google.oauth2.credentials.Credentials: As credenciais, ou None se o arquivo não existir.
+
+    Raises:
+        Exception: Erros de leitura/interpretação de `Credentials.from_authorized_user_file`.
+    """
+    try:
+        stat_info = os.stat(token_file_path)
+    except FileNotFoundError:
+        return None
+    with _TOKEN_STAT_CACHE_LOCK:
+        cached = _TOKEN_STAT_CACHE.get(token_file_path)
+    if cached is not None and cached[0] == stat_info.st_mtime_ns and cached[1] == stat_info.st_size:
+        logger.debug("Arquivo de token inalterado; reutilizando credenciais já carregadas.")
+        return cached[2]
+    creds = Credentials.from_authorized_user_file(token_file_path, SCOPES)
+    with _TOKEN_STAT_CACHE_LOCK:
+        _TOKEN_STAT_CACHE[token_file_path] = (stat_info.st_mtime_ns, stat_info.st_size, creds)
+    return creds
+
+
+def _save_token(creds, token_file_path):
+    """
+    Salva as credenciais no arquivo de token de forma atômica.
+
+    Escreve em um arquivo temporário ao lado do destino (com permissão 0600),
+    força os dados para o disco com `fsync` e o move com `os.replace`, para que
+    uma falha no meio da escrita não corrompa o token existente. Se o conteúdo
+    em disco já for idêntico, nenhuma escrita é feita.
+
+    Returns:
+        bool: True se o arquivo foi salvo (ou já estava atualizado), False caso contrário.
+    """
+    token_data = creds.to_json().encode('utf-8')
+    try:
+        with open(token_file_path, 'rb') as token_file:
+            if token_file.read() == token_data:
+                logger.debug("Arquivo de token já está atualizado; escrita ignorada.")
+                _remember_token_stat(token_file_path, creds)
+                return True
+    except OSError:
+        pass
+
+    temp_file_path = token_file_path + ".tmp"
+    try:
+        fd = os.open(temp_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as token_file:
+            token_file.write(token_data)
+            token_file.flush()
+            os.fsync(token_file.fileno())
+        os.chmod(temp_file_path, 0o600)
+        os.replace(temp_file_path, token_file_path)
+        _remember_token_stat(token_file_path, creds)
+        logger.info(f"Credenciais salvas em: {token_file_path}")
+        return True
+    except (IOError, OSError) as e:
+        logger.error(f"Erro ao salvar o arquivo de token em {token_file_path}: {e}")
+        if os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except OSError:
+                pass
+        return False
+
+
+class RefreshingCredentials:
+    """
+    Envolve um objeto `Credentials` e o atualiza em segundo plano antes de expirar.
+
+    Um temporizador (thread daemon) é agendado para `REFRESH_MARGIN` antes da
+    expiração do token. Quando dispara, chama `creds.refresh()` fora do caminho das
+    requisições e regrava o arquivo de token, de modo que a próxima chamada à API
+    não precise bloquear em uma ida ao endpoint de token do Google. Um `threading.Event`
+    garante que apenas uma atualização esteja em andamento por vez.
+    """
+
+    def __init__(self, creds, token_file_path, margin=REFRESH_MARGIN):
+        self.creds = creds
+        self.token_file_path = token_file_path
+        self.margin = margin
+        self._refreshing = threading.Event()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def is_stale(self):
+        """Indica se o token expira dentro da margem configurada."""
+        expiry = getattr(self.creds, 'expiry', None)
+        if expiry is None:
+            return False
+        return expiry - _utcnow() < self.margin
+
+    def schedule(self):
+        """Agenda a próxima atualização em segundo plano para `margin` antes da expiração."""
+        expiry = getattr(self.creds, 'expiry', None)
+        if expiry is None or not self.creds.refresh_token:
+            return
+        delay = max((expiry - self.margin - _utcnow()).total_seconds(), 0)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.refresh_in_background, kwargs={'force': True})
+            self._timer.daemon = True
+            self._timer.start()
+        logger.debug(f"Atualização do token agendada para daqui a {delay:.0f} segundos.")
+
+    def refresh_in_background(self, force=False):
+        """
+        Dispara a atualização do token em uma thread daemon se ele estiver velho.
+
+        Retorna imediatamente; as credenciais atuais continuam sendo usadas até a
+        atualização terminar. Chamadas concorrentes não disparam atualizações duplicadas.
+
+        Args:
+            force (bool): Se True, atualiza mesmo que o token ainda não esteja na margem
+                          (usado pelo temporizador, que pode disparar levemente adiantado).
+        """
+        if not self.creds.refresh_token or not (force or self.is_stale()):
+            return
+        with self._lock:
+            if self._refreshing.is_set():
+                return
+            self._refreshing.set()
+        threading.Thread(target=self._refresh, name="drivesync-token-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            logger.info("Token próximo da expiração. Atualizando credenciais em segundo plano...")
+            self.creds.refresh(GoogleAuthRequest())
+            logger.info("Credenciais atualizadas em segundo plano com sucesso.")
+            _save_token(self.creds, self.token_file_path)
+            self.schedule()
+        except Exception as e:
+            logger.warning(f"Falha na atualização das credenciais em segundo plano: {e}. A atualização ocorrerá na próxima requisição.")
+        finally:
+            self._refreshing.clear()
+
 def get_drive_service(config: configparser.ConfigParser):
     """
     Autentica com a API do Google Drive e retorna um objeto de serviço.
@@ -24,6 +260,13 @@ def get_drive_service(config: configparser.ConfigParser):
     Neste caso, o usuário será solicitado a autorizar o aplicativo através do navegador.
     As novas credenciais são então salvas no arquivo de token para uso futuro.
 
+    O serviço construído é memorizado por (arquivo de token, escopos): chamadas
+    seguintes retornam o mesmo objeto enquanto as credenciais forem válidas. Se
+    as credenciais em cache expirarem, elas são atualizadas e o serviço existente
+    é reutilizado; um novo serviço só é construído quando as credenciais mudam.
+    O serviço usa um único transporte HTTP autorizado (`build_authorized_http`),
+    compartilhado por todas as chamadas à API feitas através dele.
+
     Args:
         config (configparser.ConfigParser): Objeto ConfigParser contendo as
             configurações da aplicação, incluindo os caminhos para o
@@ -36,6 +279,7 @@ def get_drive_service(config: configparser.ConfigParser):
                                             a autenticação falhar.
     """
     creds = None
+    cached = None
     token_file_path = None
     client_secret_file_path = None
 
@@ -43,7 +287,7 @@ def get_drive_service(config: configparser.ConfigParser):
         # Obter caminhos dos arquivos de configuração
         # Assumindo que os caminhos em config.ini são relativos ao diretório raiz do projeto
         # ou são caminhos absolutos.
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Project root /app
+        base_path = _PROJECT_ROOT
 
         raw_token_file = config.get('DriveAPI', 'token_file', fallback='token.pickle') # Default from problem description, but .json is more common
         raw_client_secret_file = config.get('DriveAPI', 'client_secret_file', fallback='credentials.json') # Default from problem
@@ -59,6 +303,19 @@ def get_drive_service(config: configparser.ConfigParser):
         else:
             client_secret_file_path = raw_client_secret_file
 
+        cache_key = (client_secret_file_path, token_file_path, tuple(SCOPES))
+        with _SERVICE_CACHE_LOCK:
+            cached = _SERVICE_CACHE.get(cache_key)
+        if cached is not None:
+            cached_service, refresher = cached
+            cached_creds = refresher.creds
+            if cached_creds.valid:
+                logger.debug("Reutilizando serviço Google Drive em cache.")
+                refresher.refresh_in_background()
+                return cached_service
+            # Credenciais em cache expiradas: tentar atualizá-las abaixo em vez de reler o arquivo
+            creds = cached_creds
+
         logger.info(f"Caminho do arquivo de token: {token_file_path}")
         logger.info(f"Caminho do arquivo de client_secret: {client_secret_file_path}")
 
@@ -68,10 +325,11 @@ def get_drive_service(config: configparser.ConfigParser):
             return None
 
         # Carregar credenciais existentes do arquivo de token
-        if os.path.exists(token_file_path):
+        if creds is None:
             try:
-                creds = Credentials.from_authorized_user_file(token_file_path, SCOPES)
-                logger.info("Credenciais carregadas do arquivo de token.")
+                creds = _load_token_credentials(token_file_path)
+                if creds is not None:
+                    logger.info("Credenciais carregadas do arquivo de token.")
             except Exception as e:
                 logger.warning(f"Não foi possível carregar credenciais de {token_file_path}: {e}. Será tentado um novo fluxo.")
                 creds = None # Garantir que creds seja None se o carregamento falhar
@@ -100,19 +358,28 @@ def get_drive_service(config: configparser.ConfigParser):
                     logger.error(f"Erro durante o fluxo OAuth: {e}")
                     return None # Não foi possível obter credenciais
 
-            # Salvar as novas credenciais (ou atualizadas) no arquivo de token
-            try:
-                with open(token_file_path, 'w') as token_file:
-                    token_file.write(creds.to_json())
-                logger.info(f"Credenciais salvas em: {token_file_path}")
-            except IOError as e:
-                logger.error(f"Erro ao salvar o arquivo de token em {token_file_path}: {e}")
-                # Continuar mesmo assim, o serviço pode funcionar nesta sessão
+            # Salvar as novas credenciais (ou atualizadas) no arquivo de token.
+            # Em caso de falha, continuar mesmo assim: o serviço pode funcionar nesta sessão.
+            _save_token(creds, token_file_path)
+
+        # Se as credenciais em cache foram apenas atualizadas, o serviço existente continua válido
+        if cached is not None and creds is cached[1].creds:
+            logger.info("Credenciais em cache atualizadas; reutilizando o serviço Google Drive existente.")
+            cached[1].schedule()
+            return cached[0]
 
         # Construir e retornar o serviço da API
         try:
-            service = build('drive', 'v3', credentials=creds)
+            http_timeout = config.getint('DriveAPI', 'http_timeout_seconds', fallback=DEFAULT_HTTP_TIMEOUT)
+            # Usar o documento de discovery do Drive v3 empacotado com o googleapiclient:
+            # evita a requisição HTTP do discovery (e o aviso do file_cache) a cada build().
+            service = build('drive', 'v3', http=build_authorized_http(creds, http_timeout), model=_response_model(),
+                            static_discovery=True, cache_discovery=False)
             logger.info("Serviço Google Drive API construído com sucesso.")
+            refresher = RefreshingCredentials(creds, token_file_path)
+            refresher.schedule()
+            with _SERVICE_CACHE_LOCK:
+                _SERVICE_CACHE[cache_key] = (service, refresher)
             return service
         except HttpError as e:
             logger.error(f"Erro ao construir o serviço Google Drive: {e}")
@@ -0,0 +1,92 @@
+"""Módulo para leitura dos argumentos de linha de comando do DriveSync."""
+
+import sys
+import types
+
+# Flags without a value, and flags taking one string value (as `--flag value` or `--flag=value`)
+BOOL_FLAGS = frozenset({'--authenticate', '--list-local', '--test-drive-ops', '--sync', '--dry-run', '--verify'})
+STR_FLAGS = frozenset({'--source-folder', '--target-drive-folder-id'})
+
+# Bits of the action mask returned by `action_mask`
+AUTHENTICATE, LIST_LOCAL, TEST_DRIVE_OPS, SYNC, VERIFY, DRY_RUN = 1, 2, 4, 8, 16, 32
+# Actions that need an authenticated Drive service
+DRIVE_ACTIONS = AUTHENTICATE | TEST_DRIVE_OPS | SYNC | VERIFY
+ANY_ACTION = DRIVE_ACTIONS | LIST_LOCAL
+
+USAGE = (
+    "usage: drivesync [-h] [--authenticate] [--list-local] [--test-drive-ops] [--sync]\n"
+    "                 [--source-folder SOURCE_FOLDER] [--target-drive-folder-id TARGET_DRIVE_FOLDER_ID]\n"
+    "                 [--dry-run] [--verify]\n"
+)
+
+HELP = USAGE + """
+DriveSyncApp: Synchronizes a local folder with Google Drive.
+
+options:
+  -h, --help            show this help message and exit
+  --authenticate        Authenticate with Google Drive and save credentials.
+  --list-local          List local files in the configured source_folder.
+  --test-drive-ops      Run test operations on Google Drive (create folder, list root).
+  --sync                Initiate the synchronization process.
+  --source-folder SOURCE_FOLDER
+                        Override the source_folder from config.ini for the current run.
+  --target-drive-folder-id TARGET_DRIVE_FOLDER_ID
+                        Override the target_drive_folder_id from config.ini for the current run.
+  --dry-run             Simulate sync operations without making any changes to Google Drive or
+                        local state. Use with --sync.
+  --verify              Verify synced files against Drive and local state. Compares local file
+                        sizes with Drive file sizes.
+"""
+
+def _attr_name(flag):
+    return flag[2:].replace('-', '_')
+
+def print_help():
+    """Writes the help text to stdout."""
+    sys.stdout.write(HELP)
+
+def _fail(message):
+    """Prints usage and the error to stderr and exits with status 2, like argparse."""
+    sys.stderr.write(f"{USAGE}drivesync: error: {message}\n")
+    sys.exit(2)
+
+def parse_args(argv):
+    """
+    Parses the command line in a single pass over `argv[1:]`.
+
+    The flag set is flat (switches plus two string options), so no parser
+    object is built. `-h`/`--help` prints the help text and exits; unknown
+    flags and missing values exit with status 2, as argparse does.
+
+    Args:
+        argv (list): The full argument vector, normally `sys.argv`.
+
+    Returns:
+        types.SimpleNamespace: One attribute per flag (`sync`, `dry_run`,
+        `source_folder`, ...); switches default to False, values to None.
+    """
+    args = types.SimpleNamespace(**{_attr_name(f): False for f in BOOL_FLAGS},
+                                 **{_attr_name(f): None for f in STR_FLAGS})
+    tokens = iter(argv[1:])
+    for token in tokens:
+        if token in BOOL_FLAGS:
+            setattr(args, _attr_name(token), True)
+            continue
+        if token in ('-h', '--help'):
+            print_help()
+            sys.exit(0)
+        flag, has_value, value = token.partition('=')
+        if flag not in STR_FLAGS:
+            _fail(f"unrecognized arguments: {token}")
+        if not has_value:
+            value = next(tokens, None)
+            if value is None or value.startswith('--'):
+                _fail(f"argument {flag}: expected one argument")
+        setattr(args, _attr_name(flag), value)
+    return args
+
+def action_mask(args):
+    """Folds the parsed switches into one int, so combined checks are a single bitwise AND."""
+    return ((AUTHENTICATE if args.authenticate else 0) | (LIST_LOCAL if args.list_local else 0)
+            | (TEST_DRIVE_OPS if args.test_drive_ops else 0) | (SYNC if args.sync else 0)
+            | (VERIFY if args.verify else 0) | (DRY_RUN if args.dry_run else 0))
@@ -0,0 +1,95 @@
+"""Módulo para leitura rápida do arquivo de configuração (config.ini)."""
+
+import configparser
+import re
+
+# Section headers and `key = value` lines; comment lines (';' or '#') never match KV_RE
+SECTION_RE = re.compile(r'^\[([^\]]+)\][ \t\r]*$', re.M)
+KV_RE = re.compile(r'^([^;#:=\s\[][^:=\n]*?)[ \t]*=[ \t]*([^\n]*)', re.M)
+# Lines that are neither blank nor comments; each must be a section header or a key/value pair
+_SIGNIFICANT_RE = re.compile(r'^[ \t]*[^;#\s]', re.M)
+
+def load_ini(text):
+    """
+    Parses INI text made only of section headers, `key = value` lines, comments
+    and blank lines into {section: {key: value}}.
+
+    Returns:
+        dict: The parsed sections, or None if the text uses anything else
+        (continuation lines, `key: value` pairs, keys outside a section,
+        `%` interpolation, repeated sections or keys), which must be left to
+        `configparser`.
+    """
+    if '%' in text:
+        return None
+    sections = list(SECTION_RE.finditer(text))
+    if not sections:
+        return None
+
+    parsed = {}
+    matched_lines = len(sections)
+    for index, section in enumerate(sections):
+        end = sections[index + 1].start() if index + 1 < len(sections) else len(text)
+        if section.group(1) in parsed:
+            return None
+        values = parsed[section.group(1)] = {}
+        for kv in KV_RE.finditer(text, section.end(), end):
+            key = kv.group(1)
+            if key.lower() in values:
+                return None
+            values[key.lower()] = kv.group(2).rstrip()
+            matched_lines += 1
+
+    # Anything else (including lines before the first section) is left to configparser
+    if matched_lines != len(_SIGNIFICANT_RE.findall(text)):
+        return None
+    return parsed
+
+class FastConfigParser(configparser.ConfigParser):
+    """
+    `ConfigParser` whose `read`/`read_string` parse plain INI text with `load_ini`.
+
+    Files with a simple layout (like the shipped config.ini) skip the per-line
+    state machine of `ConfigParser.read`: their values are stored directly, the
+    same way `read` stores them. Anything else falls back to the standard parser,
+    so lookups, conversions, fallbacks and errors behave exactly as with
+    `ConfigParser`.
+    """
+
+    def read(self, filenames, encoding=None):
+        if isinstance(filenames, (str, bytes)) or hasattr(filenames, '__fspath__'):
+            filenames = [filenames]
+        read_ok = []
+        for filename in filenames:
+            try:
+                with open(filename, encoding=encoding) as f:
+                    text = f.read()
+            except OSError:
+                continue
+            self.read_string(text, source=str(filename))
+            read_ok.append(filename)
+        return read_ok
+
+    def read_string(self, string, source='<string>'):
+        parsed = load_ini(string)
+        if parsed is None:
+            super().read_string(string, source=source)
+        else:
+            self._store_parsed(parsed)
+
+    def apply_overrides(self, section, values):
+        """Sets `values` ({key: str}) in `section`, creating it if needed, without the per-key `__setitem__` checks."""
+        self._store_parsed({section: values})
+
+    def _store_parsed(self, parsed):
+        """Stores `load_ini` output into the parser's sections (as `ConfigParser._read` does, without validation)."""
+        for name, values in parsed.items():
+            if name == self.default_section:
+                section = self._defaults
+            else:
+                if name not in self._sections:
+                    self._sections[name] = self._dict()
+                    self._proxies[name] = configparser.SectionProxy(self, name)
+                section = self._sections[name]
+            for key, value in values.items():
+                section[self.optionxform(key)] = value
@@ -1,18 +1,508 @@
 """Módulo para interações com a API do Google Drive (operações de ficheiros e pastas)."""
 
+import collections
+import concurrent.futures
+import datetime
+import email.utils
+import functools
+import hashlib
 import logging
 import mimetypes # For guessing MIME types
+import mmap
+import os
+import random
+import socket
+import sqlite3
+import ssl
+import threading
 import time # For sleep in retry logic
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload # For file uploads
+from googleapiclient.http import MediaIoBaseUpload # For file uploads
+from . import metadata_cache
+from .autenticacao_drive import DEFAULT_HTTP_TIMEOUT, build_authorized_http
+
+try:
+    from orjson import loads as _loads # Optional; parses bytes directly and much faster than json
+except ImportError:
+    from json import loads as _loads
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Load the MIME type tables now rather than on the first guess inside an upload
+mimetypes.init()
+
+# Maximum number of sub-requests Drive accepts in a single batch HTTP request
+DRIVE_BATCH_LIMIT = 100
+
+# Largest page size accepted by files.list (the API default is 100)
+LIST_PAGE_SIZE = 1000
+
+FOLDER_MIME_TYPE = metadata_cache.FOLDER_MIME_TYPE
+DriveItem = metadata_cache.DriveItem
+
+# Safety margin subtracted from the local clock when stamping a cached listing,
+# so items modified on Drive around listing time are picked up by the next delta query.
+DELTA_LISTING_MARGIN = datetime.timedelta(seconds=60)
+
+MIB = 1024 * 1024
+
+# Default chunk size for resumable uploads ([Upload] chunksize_mb). Drive requires every chunk
+# but the last to be a multiple of 256 KiB, which a whole number of MiB always is.
+DEFAULT_CHUNKSIZE_MB = 16
+
+# Files smaller than this are sent in a single multipart request instead of a
+# resumable session ([Upload] simple_upload_max_mb)
+DEFAULT_SIMPLE_UPLOAD_MAX_MB = 5
+
+# Upload progress is logged only when it advanced by at least this many percentage points
+PROGRESS_LOG_STEP_PERCENT = 5
+
+# Threads fetching the next page of folder listings in the background (see iter_folder_contents)
+PREFETCH_WORKERS = 4
+
+# Default number of files uploaded concurrently by upload_many() ([Upload] upload_concurrency)
+DEFAULT_UPLOAD_WORKERS = 6
+
+# Process-wide cap on resumable upload chunks in flight, bounding their resident buffers
+# to roughly MAX_CONCURRENT_CHUNKS x chunksize regardless of how many uploads run.
+# Single-request uploads (below simple_upload_max_mb) are bounded by the upload workers instead.
+MAX_CONCURRENT_CHUNKS = 8
+_CHUNK_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_CHUNKS)
+
+# Default process-wide cap on other Drive requests in flight ([DriveAPI] max_concurrent_requests),
+# shared by listings, prefetches, folder creation and batches across all threads
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+_REQUEST_SLOTS = threading.BoundedSemaphore(DEFAULT_MAX_CONCURRENT_REQUESTS)
+
+# One file upload for upload_many(); mime_type is guessed when None
+UploadJob = collections.namedtuple(
+    'UploadJob', 'local_file_path file_name parent_drive_folder_id mime_type', defaults=(None,)
+)
+
+# Default [API_Retries] settings used by retry_with_backoff
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_INITIAL_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_BACKOFF_SECONDS = 32.0
+DEFAULT_BACKOFF_FACTOR = 3.0
+DEFAULT_MAX_ELAPSED_SECONDS = 300.0
+
+# HTTP statuses and 403 reasons treated as transient
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_403_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+# Network-level failures worth retrying (socket.timeout is an OSError alias on 3.10+)
+TRANSIENT_NETWORK_ERRORS = (socket.timeout, ConnectionError, ssl.SSLError)
+
+# Retry settings used by retry_with_backoff, resolved once by init_drive_config()
+RetryCfg = collections.namedtuple(
+    'RetryCfg',
+    'max_retries initial_backoff max_backoff backoff_factor max_elapsed retryable_statuses retryable_403_reasons',
+    defaults=(DEFAULT_MAX_RETRIES, DEFAULT_INITIAL_BACKOFF_SECONDS, DEFAULT_MAX_BACKOFF_SECONDS,
+              DEFAULT_BACKOFF_FACTOR, DEFAULT_MAX_ELAPSED_SECONDS, RETRYABLE_STATUSES, RETRYABLE_403_REASONS)
+)
+
+# Module configuration, set once by init_drive_config()
+_config = None
+_retry_cfg = RetryCfg()
+_metadata_cache = None
+_upload_chunksize = DEFAULT_CHUNKSIZE_MB * MIB
+_simple_upload_max_bytes = DEFAULT_SIMPLE_UPLOAD_MAX_MB * MIB
+_upload_workers = DEFAULT_UPLOAD_WORKERS
+_http_timeout = DEFAULT_HTTP_TIMEOUT
+_supports_all_drives = False
+_PREFETCH_EXECUTOR = None
+_PREFETCH_LOCK = threading.Lock()
+_PREFETCH_STATE = threading.local()
+
+def _list_scope_kwargs():
+    """
+    Returns the corpus arguments passed to every `files.list` call.
+
+    By default listings are restricted to the user's own corpus, so Drive skips
+    shared-drive indices. With `[DriveAPI] shared_drives = true` items from all
+    drives are included instead.
+    """
+    if _supports_all_drives:
+        return {'corpora': 'allDrives', 'includeItemsFromAllDrives': True, 'supportsAllDrives': True}
+    return {'corpora': 'user', 'supportsAllDrives': False}
+
+def _read_retry_cfg(config):
+    """Builds a `RetryCfg` from the `[API_Retries]` section, falling back to the defaults if it is invalid."""
+    try:
+        return RetryCfg(
+            max_retries=config.getint('API_Retries', 'max_retries', fallback=DEFAULT_MAX_RETRIES),
+            initial_backoff=config.getfloat('API_Retries', 'initial_backoff_seconds', fallback=DEFAULT_INITIAL_BACKOFF_SECONDS),
+            max_backoff=config.getfloat('API_Retries', 'max_backoff_seconds', fallback=DEFAULT_MAX_BACKOFF_SECONDS),
+            backoff_factor=config.getfloat('API_Retries', 'backoff_factor', fallback=DEFAULT_BACKOFF_FACTOR),
+            max_elapsed=config.getfloat('API_Retries', 'max_elapsed_seconds', fallback=DEFAULT_MAX_ELAPSED_SECONDS)
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid [API_Retries] configuration ({e}). Using defaults.")
+        return RetryCfg()
+
+def init_drive_config(config):
+    """
+    Configures this module from the application's configuration.
+
+    Retry settings are read once from `[API_Retries]`. Opens the persistent metadata cache when `metadata_cache_file` is set in the
+    `[Cache]` section. Without it, folder lookups and listings are only cached in
+    memory for the current process. Upload sizing is read from the `[Upload]`
+    section (`chunksize_mb`, `simple_upload_max_mb`, `upload_concurrency`),
+    `[DriveAPI] shared_drives` selects whether listings include shared drives, and
+    `[DriveAPI] max_concurrent_requests` caps the API requests in flight.
+
+    Args:
+        config (configparser.ConfigParser): The application's loaded configuration object.
+    """
+    global _config, _retry_cfg, _metadata_cache, _upload_chunksize, _simple_upload_max_bytes, _upload_workers, _http_timeout, _supports_all_drives
+    global _REQUEST_SLOTS
+    _config = config
+    _retry_cfg = _read_retry_cfg(config)
+    _http_timeout = config.getint('DriveAPI', 'http_timeout_seconds', fallback=DEFAULT_HTTP_TIMEOUT)
+    _supports_all_drives = config.getboolean('DriveAPI', 'shared_drives', fallback=False)
+    _REQUEST_SLOTS = threading.BoundedSemaphore(
+        max(1, config.getint('DriveAPI', 'max_concurrent_requests', fallback=DEFAULT_MAX_CONCURRENT_REQUESTS))
+    )
+    _upload_chunksize = config.getint('Upload', 'chunksize_mb', fallback=DEFAULT_CHUNKSIZE_MB) * MIB
+    _simple_upload_max_bytes = config.getint('Upload', 'simple_upload_max_mb', fallback=DEFAULT_SIMPLE_UPLOAD_MAX_MB) * MIB
+    _upload_workers = max(1, config.getint('Upload', 'upload_concurrency', fallback=DEFAULT_UPLOAD_WORKERS))
+    cache_file = config.get('Cache', 'metadata_cache_file', fallback=None)
+    if _metadata_cache is not None:
+        _metadata_cache.close()
+        _metadata_cache = None
+    if cache_file:
+        try:
+            _metadata_cache = metadata_cache.MetadataCache(cache_file)
+        except sqlite3.Error as e:
+            logger.error(f"Could not open metadata cache '{cache_file}': {e}. Continuing without persistent cache.")
+
+def _http_error_reason(error):
+    """Extracts the first `reason` from an HttpError's JSON body, or None."""
+    try:
+        details = _loads(error.content)
+        return details['error']['errors'][0]['reason']
+    except Exception:
+        return None
+
+def _retry_after_seconds(error):
+    """Returns the delay advised by an HttpError's `Retry-After` header, in seconds, or None."""
+    if not isinstance(error, HttpError):
+        return None
+    retry_after = error.resp.get('retry-after') if hasattr(error.resp, 'get') else None
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:  # The header may also carry an HTTP date
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        if retry_at.tzinfo is None:  # A '-0000' zone parses as naive; HTTP dates are always UTC
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _log_http_error(error, context):
+    """Logs an HttpError that survived the retries, with its status, reason and response body."""
+    error_content = error.content.decode('utf-8', 'ignore') if error.content else 'No additional content.'
+    logger.error(
+        f"API error occurred while {context}. "
+        f"Status: {getattr(error.resp, 'status', 'N/A')}. "
+        f"Reason: {getattr(error.resp, 'reason', 'N/A')}. "
+        f"Details: {error_content}"
+    )
+
+def _is_retryable(error):
+    """Tells whether an exception raised by a Drive call is transient and worth retrying."""
+    if isinstance(error, HttpError):
+        status = getattr(error.resp, 'status', None)
+        if status in _retry_cfg.retryable_statuses:
+            return True
+        return status == 403 and _http_error_reason(error) in _retry_cfg.retryable_403_reasons
+    return isinstance(error, TRANSIENT_NETWORK_ERRORS)
+
+def _is_rate_limited(error):
+    """Tells whether an exception is a rate-limit rejection (429, or 403 rate-limit reasons), which Drive did not carry out."""
+    if isinstance(error, HttpError):
+        status = getattr(error.resp, 'status', None)
+        if status == 429:
+            return True
+        return status == 403 and _http_error_reason(error) in _retry_cfg.retryable_403_reasons
+    return False
+
+def retry_with_backoff(api_call_func):
+    """
+    Decorator that retries a Drive API call on transient errors with jittered exponential backoff.
+
+    Retries on HTTP 429/500/502/503/504, on 403 `rateLimitExceeded`/`userRateLimitExceeded`,
+    and on network errors (timeouts, connection resets, SSL errors). When the
+    response carries a `Retry-After` header that delay is honoured; otherwise each wait is
+    drawn uniformly from `[initial, previous_wait * factor]`, capped at `max_backoff`
+    ("decorrelated jitter"), so concurrent callers drift apart instead of retrying
+    in lockstep. Retrying is abandoned once `max_elapsed_seconds` have passed since
+    the first failure (measured with a monotonic clock).
+    Parameters come from the `[API_Retries]` section of the configuration, read
+    once by `init_drive_config`.
+    When retries are exhausted, or for non-retryable errors, the last exception is re-raised.
+    """
+    @functools.wraps(api_call_func)
+    def wrapper(*args, **kwargs):
+        # Fast path: a first attempt that succeeds needs no deadline, counter or jitter state
+        try:
+            return api_call_func(*args, **kwargs)
+        except Exception as e:
+            if not _is_retryable(e):
+                raise
+            error = e
+
+        cfg = _retry_cfg
+        deadline = time.monotonic() + cfg.max_elapsed
+        attempt = 0
+        sleep_for = cfg.initial_backoff
+        while True:
+            attempt += 1
+            if attempt > cfg.max_retries:
+                logger.error(f"API call '{api_call_func.__name__}' failed after {cfg.max_retries} retries: {error}")
+                raise error
+            wait_time = _retry_after_seconds(error) # Server-advised delay (429/503) takes precedence
+            if wait_time is None:
+                # Decorrelated jitter: drawn between the initial backoff and backoff_factor x the previous wait
+                sleep_for = min(cfg.max_backoff, random.uniform(cfg.initial_backoff, sleep_for * cfg.backoff_factor))
+                wait_time = sleep_for
+            if time.monotonic() + wait_time > deadline:
+                logger.error(f"API call '{api_call_func.__name__}' exceeded its {cfg.max_elapsed:.0f}s retry deadline: {error}")
+                raise error
+            logger.warning("API call '%s' failed (%s). Retry %d/%d in %.2f seconds...",
+                           api_call_func.__name__, error, attempt, cfg.max_retries, wait_time)
+            time.sleep(wait_time)
+            try:
+                return api_call_func(*args, **kwargs)
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                error = e
+    return wrapper
+
+@retry_with_backoff
+def _execute_drive_request(request, http=None):
+    """
+    Executes a googleapiclient request, retrying transient failures.
+
+    A request slot is held only while the request is in flight, so threads
+    waiting out a backoff do not count against the concurrency cap.
+    """
+    with _REQUEST_SLOTS:
+        return request.execute(http=http)
+
+@retry_with_backoff
+def _execute_next_chunk(request, http=None):
+    """
+    Sends the next chunk of a resumable upload, retrying transient failures.
+
+    On retry the upload continues from the last byte acknowledged by Drive;
+    a chunk slot is held only while a chunk is in flight, not while waiting to retry.
+    """
+    with _CHUNK_SLOTS:
+        return request.next_chunk(http=http)
+
+def _execute_create(request, lookup_request, accept=None, http=None):
+    """
+    Executes a `files.create` request without creating the item twice.
+
+    A create is not idempotent, so it is resent as-is only after a rate-limit
+    rejection, which guarantees Drive did not carry it out. After any other
+    transient failure (5xx, timeouts, resets) it may have succeeded server-side,
+    so `lookup_request` (a `files.list` by name and parent) is run first and
+    the first listed item passing `accept` is returned instead of creating again.
+
+    Returns:
+        dict: The create response, or the matching item found by the lookup.
+    """
+    lookup_first = False
+
+    @retry_with_backoff
+    def create(): # Retried on every transient error; only the lookup makes that safe
+        nonlocal lookup_first
+        if lookup_first:
+            with _REQUEST_SLOTS:
+                listed = lookup_request.execute(http=http).get('files', [])
+            for item in listed:
+                if accept is None or accept(item):
+                    logger.info("Create of '%s' had failed after reaching Drive; using the existing item %s.",
+                                item.get('name'), item.get('id'))
+                    return item
+        try:
+            with _REQUEST_SLOTS:
+                return request.execute(http=http)
+        except Exception as e:
+            lookup_first = not _is_rate_limited(e)
+            raise
+    return create()
+
+def _service_credentials(drive_service):
+    """Returns the credentials behind a service's authorized transport, or None."""
+    return getattr(getattr(drive_service, '_http', None), 'credentials', None)
+
+def _refresh_service_credentials(drive_service):
+    """Forces a refresh of the credentials behind a service's authorized transport."""
+    credentials = _service_credentials(drive_service)
+    if credentials is None or not getattr(credentials, 'refresh_token', None):
+        return False
+    try:
+        credentials.refresh(GoogleAuthRequest())
+        return True
+    except Exception as e:
+        logger.error(f"Failed to refresh Drive credentials: {e}")
+        return False
+
+def _delta_listing_stamp():
+    """Returns the RFC 3339 (UTC) timestamp recorded for a listing that is about to start."""
+    now = datetime.datetime.now(datetime.timezone.utc) - DELTA_LISTING_MARGIN
+    return now.strftime('%Y-%m-%dT%H:%M:%S')
+
+# In-process LRU cache of resolved folder IDs, keyed by (parent_folder_id, folder_name).
+# Folder IDs do not change during a run, so each distinct folder is looked up once;
+# the least recently used entries are evicted beyond FOLDER_ID_CACHE_MAXSIZE.
+FOLDER_ID_CACHE_MAXSIZE = 4096
+_FOLDER_ID_CACHE = collections.OrderedDict()
+_FOLDER_ID_CACHE_LOCK = threading.Lock()
+
+def _folder_cache_get(cache_key):
+    """Returns the cached folder ID for (parent_folder_id, folder_name), or None."""
+    with _FOLDER_ID_CACHE_LOCK:
+        folder_id = _FOLDER_ID_CACHE.get(cache_key)
+        if folder_id is not None:
+            _FOLDER_ID_CACHE.move_to_end(cache_key)
+        return folder_id
+
+def _folder_cache_put(cache_key, folder_id, overwrite=True):
+    """Records a resolved folder ID. Must be called with _FOLDER_ID_CACHE_LOCK held."""
+    if not overwrite and cache_key in _FOLDER_ID_CACHE:
+        return
+    _FOLDER_ID_CACHE[cache_key] = folder_id
+    _FOLDER_ID_CACHE.move_to_end(cache_key)
+    if len(_FOLDER_ID_CACHE) > FOLDER_ID_CACHE_MAXSIZE:
+        _FOLDER_ID_CACHE.popitem(last=False)
+
+def local_md5(local_file_path):
+    """
+    Returns the hex MD5 digest of a local file, comparable to Drive's `md5Checksum`.
+
+    The file is memory-mapped and hashed in a single C call (with the GIL released),
+    avoiding a Python read loop and intermediate buffers. Empty files and files that
+    cannot be mapped fall back to a buffered read.
+    """
+    with open(local_file_path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.md5(mapped).hexdigest()
+        except (ValueError, OSError, OverflowError):
+            pass  # Empty file, special file or address space too small: hash with reads instead
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+: hashed in C over a buffered read
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        digest = hashlib.md5()
+        for block in iter(lambda: f.read(MIB), b''):
+            digest.update(block)
+        return digest.hexdigest()
+
+@functools.lru_cache(maxsize=4096)
+def _guess_mime(ext):
+    """Returns the MIME type for a lower-cased file extension, or 'application/octet-stream'."""
+    # Direct table lookup first; guess_type (URL parsing, encodings map) only for the rest
+    return mimetypes.types_map.get(ext) or mimetypes.guess_type('file' + ext)[0] or 'application/octet-stream'
+
+# Escapes backslashes and single quotes in a single C-level pass over the string
+_Q_TRANS = str.maketrans({'\\': '\\\\', "'": "\\'"})
+
+def _q_escape(value):
+    """Escapes a value for use inside a single-quoted Drive query string literal."""
+    return value.translate(_Q_TRANS)
+
+# Query template for a named child folder; the constant parts are assembled once
+_FOLDER_Q_TMPL = "name='{n}' and mimeType='" + FOLDER_MIME_TYPE + "' and '{p}' in parents and trashed=false"
+_FILE_Q_TMPL = "name='{n}' and '{p}' in parents and trashed=false"
+
+@functools.lru_cache(maxsize=1024)
+def build_child_by_name_query(parent_id, name):
+    """
+    Builds the `files.list` query that finds a non-trashed folder named `name` under `parent_id`.
+
+    Both values are escaped per Drive's query grammar (backslashes and single
+    quotes), and recently built queries are memoized so repeated path
+    components reuse the same string.
+    """
+    return _FOLDER_Q_TMPL.format(n=_q_escape(name), p=_q_escape(parent_id))
+
+def _cache_child_folders(parent_folder_id, contents):
+    """Records the child folders found in a listing so later lookups skip the API."""
+    with _FOLDER_ID_CACHE_LOCK:
+        for name, details in contents.items():
+            if details.mimeType == FOLDER_MIME_TYPE:
+                _folder_cache_put((parent_folder_id, name), details.id, overwrite=False)
+
+def invalidate_folder_cache(folder_id=None):
+    """
+    Drops entries from the folder ID caches.
+
+    Args:
+        folder_id (str, optional): ID of a folder that was deleted, moved or renamed.
+            Entries resolving to it or living under it are removed, from the
+            persistent metadata cache as well. If None, both caches are cleared.
+    """
+    with _FOLDER_ID_CACHE_LOCK:
+        if folder_id is None:
+            _FOLDER_ID_CACHE.clear()
+        else:
+            for key in [k for k, v in _FOLDER_ID_CACHE.items() if v == folder_id or k[0] == folder_id]:
+                del _FOLDER_ID_CACHE[key]
+    if _metadata_cache is not None:
+        if folder_id is None:
+            _metadata_cache.clear()
+        else:
+            _metadata_cache.forget_folder(folder_id)
+
+def _forget_missing_parent(error, parent_folder_id):
+    """Drops cached entries for a parent folder that Drive reported missing (404) on a create or upload."""
+    if isinstance(error, HttpError) and getattr(error.resp, 'status', None) == 404:
+        logger.warning(f"Drive folder '{parent_folder_id}' no longer exists; removing it from the folder ID caches.")
+        invalidate_folder_cache(parent_folder_id)
+
+def _folder_list_fields(need_checksum=True, need_mtime=True):
+    """Builds the `fields` selector for folder listings, requesting only what the caller needs."""
+    item_fields = ['id', 'name', 'mimeType', 'size']
+    if need_checksum:
+        item_fields.append('md5Checksum')
+    if need_mtime:
+        item_fields.append('modifiedTime')
+    return f"nextPageToken, files({', '.join(item_fields)})"
+
+# Default partial-response selector for get_file_metadata_batch()
+FILE_METADATA_FIELDS = 'id, name, mimeType, md5Checksum, modifiedTime, size, parents'
+
+def _add_listed_items(contents, files):
+    """Adds the items of one `files.list` page to a name-keyed contents dictionary."""
+    contents.update({
+        item['name']: DriveItem(
+            item['id'],
+            item['mimeType'],
+            item.get('md5Checksum'), # Absent for folders and when not requested
+            item.get('modifiedTime'), # Absent when not requested
+            int(item['size']) if 'size' in item else None # Drive returns size as a string; absent for folders
+        )
+        for item in files
+    })
+
 def find_or_create_folder(drive_service, parent_folder_id, folder_name):
     """
     Finds a folder by name within a parent folder, or creates it if not found.
 
+    Resolved IDs are memoized by (parent_folder_id, folder_name) for the rest of
+    the process, so repeated lookups of the same path component cost no API call.
+    Use `invalidate_folder_cache` if a folder is deleted or moved on Drive.
+
     Args:
         drive_service: Authorized Google Drive service instance.
         parent_folder_id: ID of the parent folder (can be 'root').
@@ -21,21 +511,33 @@ def find_or_create_folder(drive_service, parent_folder_id, folder_name):
     Returns:
         The ID of the found or created folder, or None if an error occurs.
     """
+    cache_key = (parent_folder_id, folder_name)
+    cached_id = _folder_cache_get(cache_key)
+    if cached_id is not None:
+        logger.debug("Folder '%s' under parent ID '%s' resolved from cache: %s", folder_name, parent_folder_id, cached_id)
+        return cached_id
+
+    if _metadata_cache is not None:
+        cached_child = _metadata_cache.get_child(parent_folder_id, folder_name)
+        if cached_child is not None and cached_child.mimeType == FOLDER_MIME_TYPE:
+            logger.debug("Folder '%s' under parent ID '%s' resolved from metadata cache: %s", folder_name, parent_folder_id, cached_child.id)
+            with _FOLDER_ID_CACHE_LOCK:
+                _folder_cache_put(cache_key, cached_child.id)
+            return cached_child.id
+
     try:
         # Search for the folder
-        # Escape single quotes in folder_name for the query
-        escaped_folder_name = folder_name.replace("'", "\\'")
-        query = (f"name='{escaped_folder_name}' and "
-                 f"mimeType='application/vnd.google-apps.folder' and "
-                 f"'{parent_folder_id}' in parents and "
-                 f"trashed=false")
-
-        response = drive_service.files().list(
+        query = build_child_by_name_query(parent_folder_id, folder_name)
+        search_request = drive_service.files().list(
             q=query,
             spaces='drive',
             fields='files(id, name)', # Only need id and name for existing folders
-            pageToken=None  # Ensure a fresh search, not continuation of unrelated listing
-        ).execute()
+            pageSize=LIST_PAGE_SIZE,
+            pageToken=None,  # Ensure a fresh search, not continuation of unrelated listing
+            **_list_scope_kwargs()
+        )
+
+        response = _execute_drive_request(search_request)
 
         folders = response.get('files', [])
 
@@ -44,167 +546,609 @@ def find_or_create_folder(drive_service, parent_folder_id, folder_name):
                 logger.warning(f"Multiple folders named '{folder_name}' found under parent ID '{parent_folder_id}'. Using the first one found (ID: {folders[0]['id']}).")
             folder_id = folders[0]['id']
             logger.info(f"Folder '{folder_name}' found with ID: {folder_id} under parent ID '{parent_folder_id}'.")
+            with _FOLDER_ID_CACHE_LOCK:
+                _folder_cache_put(cache_key, folder_id)
+            if _metadata_cache is not None:
+                _metadata_cache.store_children(parent_folder_id, {folder_name: DriveItem(folder_id, FOLDER_MIME_TYPE)})
             return folder_id
         else:
             # Create the folder
             logger.info(f"Folder '{folder_name}' not found under parent ID '{parent_folder_id}'. Creating it...")
             file_metadata = {
                 'name': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder',
+                'mimeType': FOLDER_MIME_TYPE,
                 'parents': [parent_folder_id]
             }
-            folder = drive_service.files().create(
+            # The same search is repeated before re-creating after a failure that may have reached Drive
+            folder = _execute_create(drive_service.files().create(
                 body=file_metadata,
-                fields='id' # Only need id for the new folder
-            ).execute()
+                fields='id', # Only need id for the new folder
+                supportsAllDrives=_supports_all_drives
+            ), search_request)
             folder_id = folder.get('id')
             logger.info(f"Folder '{folder_name}' created successfully with ID: {folder_id} under parent ID '{parent_folder_id}'.")
+            if folder_id:
+                with _FOLDER_ID_CACHE_LOCK:
+                    _folder_cache_put(cache_key, folder_id)
+                if _metadata_cache is not None:
+                    _metadata_cache.invalidate_folder(parent_folder_id)
+                    _metadata_cache.store_children(parent_folder_id, {folder_name: DriveItem(folder_id, FOLDER_MIME_TYPE)})
             return folder_id
 
     except HttpError as error:
-        error_content = error.content.decode('utf-8', 'ignore') if error.content else 'No additional content.'
-        logger.error(
-            f"API error occurred while finding/creating folder '{folder_name}' under parent '{parent_folder_id}'. "
-            f"Status: {error.resp.status if hasattr(error.resp, 'status') else 'N/A'}. "
-            f"Reason: {error.resp.reason if hasattr(error.resp, 'reason') else 'N/A'}. "
-            f"Details: {error_content}"
-        )
+        _log_http_error(error, f"finding/creating folder '{folder_name}' under parent '{parent_folder_id}'")
+        _forget_missing_parent(error, parent_folder_id)
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred in find_or_create_folder for '{folder_name}' under parent '{parent_folder_id}': {e}", exc_info=True)
         return None
 
-def list_folder_contents(drive_service, folder_id):
+def _execute_folder_batches(drive_service, requests, handle_response, action, retry=True):
+    """
+    Sends (request_id, request) pairs in batches of `DRIVE_BATCH_LIMIT`.
+    A batch that fails as a whole is logged and its sub-requests get no response.
+    With `retry=False` a failed batch is not resent, for sub-requests that are
+    not safe to repeat.
+    """
+    for start in range(0, len(requests), DRIVE_BATCH_LIMIT):
+        chunk = requests[start:start + DRIVE_BATCH_LIMIT]
+        batch = drive_service.new_batch_http_request(callback=handle_response)
+        for request_id, request in chunk:
+            batch.add(request, request_id=request_id)
+        try:
+            if retry:
+                _execute_drive_request(batch)
+            else:
+                with _REQUEST_SLOTS:
+                    batch.execute()
+        except Exception as e:
+            logger.error(f"Batch request {action} {len(chunk)} folders failed: {e}", exc_info=True)
+
+def find_or_create_folders_batch(drive_service, parent_folder_id, folder_names):
+    """
+    Finds or creates several folders of one parent using Drive batch HTTP requests.
+
+    Behaves like calling `find_or_create_folder` for each name, but the lookups
+    that the caches cannot answer are sent as one batch of `files.list` calls,
+    and the folders still missing as one batch of `files.create` calls (up to
+    `DRIVE_BATCH_LIMIT` sub-requests per HTTP POST), so N new sibling folders
+    cost about two round-trips instead of 2N.
+
+    Args:
+        drive_service: Authorized Google Drive service instance.
+        parent_folder_id: ID of the parent folder (can be 'root').
+        folder_names: Iterable of folder names to find or create.
+
+    Returns:
+        A dictionary mapping each name to the ID of the found or created folder,
+        or to None if it could not be resolved (callers resolve those with
+        `find_or_create_folder`, as a failed create may still have gone through).
+    """
+    results = {}
+    for folder_name in dict.fromkeys(folder_names): # Duplicates are collapsed
+        folder_id = _folder_cache_get((parent_folder_id, folder_name))
+        if folder_id is None and _metadata_cache is not None:
+            cached_child = _metadata_cache.get_child(parent_folder_id, folder_name)
+            if cached_child is not None and cached_child.mimeType == FOLDER_MIME_TYPE:
+                folder_id = cached_child.id
+        results[folder_name] = folder_id
+    # Sub-requests are identified by the index of their name, as names may be any string
+    missing = [name for name, folder_id in results.items() if folder_id is None]
+    if not missing:
+        return results
+
+    found = {}
+    def handle_list_response(request_id, response, exception):
+        folder_name = missing[int(request_id)]
+        if exception is not None:
+            logger.error(f"API error occurred while batch searching for folder '{folder_name}' under parent ID '{parent_folder_id}': {exception}")
+            return
+        folders = response.get('files', [])
+        if len(folders) > 1:
+            logger.warning(f"Multiple folders named '{folder_name}' found under parent ID '{parent_folder_id}'. Using the first one found (ID: {folders[0]['id']}).")
+        found[folder_name] = folders[0]['id'] if folders else None
+
+    _execute_folder_batches(drive_service, [
+        (str(index), drive_service.files().list(
+            q=build_child_by_name_query(parent_folder_id, folder_name),
+            spaces='drive',
+            fields='files(id, name)',
+            pageSize=LIST_PAGE_SIZE,
+            **_list_scope_kwargs()
+        ))
+        for index, folder_name in enumerate(missing)
+    ], handle_list_response, "searching")
+
+    created = {}
+    def handle_create_response(request_id, response, exception):
+        folder_name = missing[int(request_id)]
+        if exception is not None:
+            logger.error(f"API error occurred while batch creating folder '{folder_name}' under parent ID '{parent_folder_id}': {exception}")
+            _forget_missing_parent(exception, parent_folder_id)
+            return
+        created[folder_name] = response.get('id')
+
+    # Only names whose search succeeded and found nothing are created. The batch is sent once:
+    # it may have been carried out in part before failing, so the names left unresolved are
+    # handed to find_or_create_folder, which searches again before creating
+    _execute_folder_batches(drive_service, [
+        (str(index), drive_service.files().create(
+            body={'name': folder_name, 'mimeType': FOLDER_MIME_TYPE, 'parents': [parent_folder_id]},
+            fields='id',
+            supportsAllDrives=_supports_all_drives
+        ))
+        for index, folder_name in enumerate(missing)
+        if folder_name in found and found[folder_name] is None
+    ], handle_create_response, "creating", retry=False)
+
+    resolved = {name: folder_id for name, folder_id in {**found, **created}.items() if folder_id}
+    results.update(resolved)
+    with _FOLDER_ID_CACHE_LOCK:
+        for folder_name, folder_id in resolved.items():
+            _folder_cache_put((parent_folder_id, folder_name), folder_id)
+    if _metadata_cache is not None and resolved:
+        if created:
+            _metadata_cache.invalidate_folder(parent_folder_id)
+        _metadata_cache.store_children(parent_folder_id, {
+            folder_name: DriveItem(folder_id, FOLDER_MIME_TYPE) for folder_name, folder_id in resolved.items()
+        })
+
+    existing = sum(1 for folder_id in found.values() if folder_id)
+    logger.info(f"Batch resolved {len(resolved)}/{len(missing)} folders under parent ID '{parent_folder_id}' "
+                f"({existing} found, {len(resolved) - existing} created).")
+    return results
+
+def _prefetch_executor():
+    """Returns the shared thread pool that fetches listing pages ahead of their consumers."""
+    global _PREFETCH_EXECUTOR
+    with _PREFETCH_LOCK:
+        if _PREFETCH_EXECUTOR is None:
+            _PREFETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS, thread_name_prefix='drivesync-prefetch'
+            )
+        return _PREFETCH_EXECUTOR
+
+def _prefetch_page(drive_service, request):
+    """
+    Starts executing a listing request in the background and returns its future.
+
+    Each prefetch thread keeps its own authorized transport (httplib2 is not
+    thread-safe), reused across pages so its connection stays alive.
+    """
+    credentials = _service_credentials(drive_service)
+
+    def run():
+        http = None
+        if credentials is not None:
+            cached = getattr(_PREFETCH_STATE, 'http', None)
+            if cached is None or cached[0] is not credentials:
+                cached = (credentials, build_authorized_http(credentials, _http_timeout))
+                _PREFETCH_STATE.http = cached
+            http = cached[1]
+        return _execute_drive_request(request, http=http)
+
+    return _prefetch_executor().submit(run)
+
+def _folder_listing_query(folder_id, modified_since=None):
+    """Builds the `files.list` query for the children of a folder, optionally only those modified after `modified_since`."""
+    query = f"'{_q_escape(folder_id)}' in parents and trashed=false" # Ensure single quotes around folder_id
+    if modified_since is not None:
+        query += f" and modifiedTime > '{modified_since}'"
+    return query
+
+def _cached_listing_start(folder_id, use_cache):
+    """
+    Returns the starting point of a listing: (contents, listed_since).
+
+    With a complete cached listing of the folder this is the cached contents and
+    the timestamp to request changes from; otherwise ({}, None).
+    """
+    cached_listing = _metadata_cache.get_listing(folder_id) if use_cache else None
+    if cached_listing is None:
+        return {}, None
+    contents, listed_since = cached_listing
+    logger.debug(f"Using {len(contents)} cached items for folder ID '{folder_id}'; fetching changes since {listed_since}.")
+    return contents, listed_since
+
+def iter_folder_contents(drive_service, folder_id, need_checksum=True, need_mtime=True, modified_since=None):
+    """
+    Yields the items directly within a folder as each `files.list` page arrives.
+
+    Unlike `list_folder_contents`, nothing is buffered: the caller can start
+    comparing or enqueueing uploads for the first page while Drive is still
+    serving the next one, which is requested in the background as soon as the
+    current page arrives. The persistent metadata cache is not consulted, but
+    child folders are recorded in the in-memory folder ID cache page by page.
+
+    Every page, the first included, is fetched by the prefetch workers over
+    their own HTTP transports, so a listing may run on one thread while other
+    calls use `drive_service` on another.
+
+    Errors are raised, not swallowed: an `HttpError` that survives the retries
+    (or any other exception) propagates out of the iteration, after the items
+    of the pages already received have been yielded.
+
+    Args:
+        drive_service: Authorized Google Drive service instance.
+        folder_id: ID of the folder whose contents are to be listed.
+        need_checksum (bool): Whether to request `md5Checksum` for each item.
+        need_mtime (bool): Whether to request `modifiedTime` for each item.
+        modified_since (str, optional): RFC 3339 timestamp; if given, only items
+            modified after it are listed.
+
+    Yields:
+        tuple: (name, DriveItem) for each item. Drive allows duplicate names, in
+        which case each duplicate is yielded.
+    """
+    fields = _folder_list_fields(need_checksum, need_mtime)
+    query = _folder_listing_query(folder_id, modified_since)
+
+    def page_request(page_token):
+        return drive_service.files().list(
+            q=query,
+            spaces='drive',
+            fields=fields, # Only the fields the caller asked for, plus the page token
+            pageSize=LIST_PAGE_SIZE,
+            pageToken=page_token,
+            **_list_scope_kwargs()
+        )
+
+    response = _prefetch_page(drive_service, page_request(None)).result()
+    while True:
+        page_token = response.get('nextPageToken', None)
+        # Request the next page before processing this one, so its round-trip
+        # overlaps with building the items and with the consumer's own work
+        next_page = _prefetch_page(drive_service, page_request(page_token)) if page_token else None
+        try:
+            page = {}
+            _add_listed_items(page, response.get('files', []))
+            _cache_child_folders(folder_id, page)
+            yield from page.items()
+        except BaseException:
+            if next_page is not None:
+                next_page.cancel() # Consumer stopped early or failed: drop the prefetch if still queued
+            raise
+        if next_page is None:
+            break
+        response = next_page.result()
+
+def list_folder_contents(drive_service, folder_id, need_checksum=True, need_mtime=True):
     """
     Lists all files and folders directly within a given folder ID.
 
+    This materializes `iter_folder_contents` into a dictionary. Pages are
+    requested with `pageSize=LIST_PAGE_SIZE`, and the `fields` selector only
+    includes `md5Checksum`/`modifiedTime` when the caller needs them, which
+    keeps the response bodies (and their JSON decoding) small.
+
+    When the persistent metadata cache is enabled and holds a complete listing of
+    the folder, only items modified since that listing are requested from Drive
+    (`modifiedTime > ...`) and merged into the cached contents. Items trashed or
+    deleted on Drive by other clients are not detected by such a delta listing;
+    call `invalidate_folder_cache(folder_id)` to force a complete one.
+
     Args:
         drive_service: Authorized Google Drive service instance.
         folder_id: ID of the folder whose contents are to be listed.
+        need_checksum (bool): Whether to request `md5Checksum` for each item.
+        need_mtime (bool): Whether to request `modifiedTime` for each item.
 
     Returns:
-        A dictionary where keys are item names and values are dictionaries
-        containing their 'id', 'mimeType', 'md5Checksum' (if applicable),
-        and 'modifiedTime'. Returns None if an error occurs.
+        A dictionary where keys are item names and values are `DriveItem`
+        records with the fields `id`, `mimeType`, `md5Checksum` (if applicable),
+        `modifiedTime` and `size`. Fields that were not requested are None.
+        Returns None if an error occurs.
     """
-    contents = {}
-    page_token = None
+    # Only complete listings (all fields) are read from / written to the persistent cache
+    use_cache = _metadata_cache is not None and need_checksum and need_mtime
+    contents, listed_since = _cached_listing_start(folder_id, use_cache)
+    listed_at = _delta_listing_stamp()
+
     try:
-        while True:
-            query = f"'{folder_id}' in parents and trashed=false" # Ensure single quotes around folder_id
-            response = drive_service.files().list(
-                q=query,
-                spaces='drive',
-                fields='nextPageToken, files(id, name, mimeType, md5Checksum, modifiedTime)', # Correct fields for pagination and details
-                pageToken=page_token
-            ).execute()
-
-            for item in response.get('files', []):
-                contents[item['name']] = {
-                    'id': item['id'],
-                    'mimeType': item['mimeType'],
-                    'md5Checksum': item.get('md5Checksum'), # Safely get md5Checksum
-                    'modifiedTime': item['modifiedTime']
-                }
-
-            page_token = response.get('nextPageToken', None)
-            if page_token is None:
-                break
+        fetched = dict(iter_folder_contents(drive_service, folder_id, need_checksum, need_mtime, modified_since=listed_since))
+
+        contents.update(fetched)
+        if use_cache:
+            _metadata_cache.store_children(folder_id, fetched, listed_at=listed_at, replace=listed_since is None)
 
         logger.info(f"Successfully listed {len(contents)} items in folder ID '{folder_id}'.")
+        _cache_child_folders(folder_id, contents)
         return contents
 
     except HttpError as error:
-        error_content = error.content.decode('utf-8', 'ignore') if error.content else 'No additional content.'
-        logger.error(
-            f"API error occurred while listing contents for folder ID '{folder_id}'. "
-            f"Status: {error.resp.status if hasattr(error.resp, 'status') else 'N/A'}. "
-            f"Reason: {error.resp.reason if hasattr(error.resp, 'reason') else 'N/A'}. "
-            f"Details: {error_content}"
-        )
+        _log_http_error(error, f"listing contents for folder ID '{folder_id}'")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred in list_folder_contents for folder ID '{folder_id}': {e}", exc_info=True)
         return None
 
+def get_file_metadata_batch(drive_service, file_ids, fields=FILE_METADATA_FIELDS):
+    """
+    Fetches metadata for several files using Drive batch HTTP requests.
+
+    Up to `DRIVE_BATCH_LIMIT` `files.get` sub-requests are sent per HTTP POST,
+    each batch going through `retry_with_backoff`.
+
+    Args:
+        drive_service: Authorized Google Drive service instance.
+        file_ids: Iterable of Drive file IDs.
+        fields (str): Partial-response selector for each file.
+
+    Returns:
+        A dictionary mapping each file ID to its metadata dictionary, as returned
+        by `files.get`, or to the exception raised for it (e.g. an HttpError 404
+        for a deleted file) if it could not be fetched.
+    """
+    results = dict.fromkeys(file_ids)
+
+    def handle_response(request_id, response, exception):
+        results[request_id] = response if exception is None else exception
+
+    ids = list(results)
+    for start in range(0, len(ids), DRIVE_BATCH_LIMIT):
+        chunk = ids[start:start + DRIVE_BATCH_LIMIT]
+        batch = drive_service.new_batch_http_request(callback=handle_response)
+        for file_id in chunk:
+            batch.add(
+                drive_service.files().get(fileId=file_id, fields=fields, supportsAllDrives=_supports_all_drives),
+                request_id=file_id
+            )
+        try:
+            _execute_drive_request(batch)
+        except Exception as e:
+            logger.error(f"Batch metadata request failed for {len(chunk)} files: {e}", exc_info=True)
+            for file_id in chunk:
+                results[file_id] = e
+
+    fetched = sum(1 for metadata in results.values() if not isinstance(metadata, Exception))
+    logger.debug(f"Batch fetched metadata of {fetched}/{len(results)} files.")
+    return results
+
 
-def upload_file(drive_service, local_file_path, file_name, parent_drive_folder_id, mime_type=None):
+def upload_file(drive_service, local_file_path, file_name, parent_drive_folder_id, mime_type=None, http=None,
+                with_md5=False):
     """
     Uploads a file to Google Drive with resumable uploads and retry logic.
 
+    Files smaller than the configured simple-upload threshold are sent in a
+    single multipart request, skipping the resumable session initiation
+    round-trip. Larger files use a resumable session with the configured chunk
+    size (one HTTP request per chunk).
+
     Args:
         drive_service: Authorized Google Drive service instance.
         local_file_path (str): Absolute path to the local file to upload.
         file_name (str): Name of the file as it should appear on Drive.
         parent_drive_folder_id (str): ID of the Drive folder to upload into.
         mime_type (str, optional): Mime type of the file. If None, it's guessed.
+        http (optional): HTTP transport to send the upload over instead of the
+            service's own. Required when uploading from several threads, since
+            an `httplib2.Http` instance must not be shared between threads.
+        with_md5 (bool): Also return the `md5Checksum` Drive computed for the
+            uploaded content (requested in the same response, no extra call).
 
     Returns:
-        str: The Google Drive file ID if successful, None otherwise.
+        str: The Google Drive file ID if successful, None otherwise. With
+        `with_md5`, a (file_id, md5Checksum) tuple instead, (None, None) on failure.
     """
+    failed = (None, None) if with_md5 else None
     if mime_type is None:
-        mime_type = mimetypes.guess_type(local_file_path)[0]
-        if mime_type is None:  # Fallback if guess fails
-            mime_type = 'application/octet-stream'
-        logger.debug(f"Guessed MIME type for '{local_file_path}' as '{mime_type}'.")
+        mime_type = _guess_mime(os.path.splitext(local_file_path)[1].lower())
+        logger.debug("Guessed MIME type for '%s' as '%s'.", local_file_path, mime_type)
 
     try:
-        media = MediaFileUpload(local_file_path,
-                                mimetype=mime_type,
-                                resumable=True,
-                                chunksize=1024 * 1024)  # 1MB chunk size
+        # One buffered handle serves every chunk of the upload and is closed deterministically
+        file_handle = open(local_file_path, 'rb', buffering=MIB)
     except FileNotFoundError:
         logger.error(f"Local file not found for upload: {local_file_path}. File name: '{file_name}'")
-        return None
-    except Exception as e: # Catch other potential errors during MediaFileUpload initialization
-        logger.error(f"Error initializing MediaFileUpload for '{local_file_path}': {e}")
-        return None
+        return failed
+    except OSError as e:
+        logger.error(f"Error opening '{local_file_path}' for upload: {e}")
+        return failed
+
+    with file_handle:
+        try:
+            stat_info = os.fstat(file_handle.fileno())
+            if hasattr(os, 'posix_fadvise'):
+                # Chunks are read front to back; let the kernel read ahead aggressively
+                os.posix_fadvise(file_handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            resumable = stat_info.st_size >= _simple_upload_max_bytes
+            media = MediaIoBaseUpload(file_handle,
+                                      mimetype=mime_type,
+                                      resumable=resumable,
+                                      chunksize=_upload_chunksize)
+        except Exception as e: # Catch other potential errors during MediaIoBaseUpload initialization
+            logger.error(f"Error initializing upload media for '{local_file_path}': {e}")
+            return failed
 
-    file_metadata = {
-        'name': file_name,
-        'parents': [parent_drive_folder_id]
-    }
+        file_metadata = {
+            'name': file_name,
+            'parents': [parent_drive_folder_id]
+        }
 
-    request = drive_service.files().create(body=file_metadata,
-                                           media_body=media,
-                                           fields='id')
+        request = drive_service.files().create(body=file_metadata,
+                                               media_body=media,
+                                               fields='id,md5Checksum' if with_md5 else 'id',
+                                               supportsAllDrives=_supports_all_drives)
 
-    response = None
-    retry_count = 0
-    max_retries = 5
-    delay = 1  # Initial delay in seconds for exponential backoff
+        lookup = None
+        if not resumable:
+            # A file with this name and the same content already in the folder counts as this upload
+            # (see _execute_create); identical content makes an older copy equally good
+            file_md5 = functools.lru_cache(maxsize=1)(lambda: local_md5(local_file_path)) # Hashed once, if ever needed
+            lookup = (drive_service.files().list(
+                q=_FILE_Q_TMPL.format(n=_q_escape(file_name), p=_q_escape(parent_drive_folder_id)),
+                spaces='drive',
+                fields='files(id, name, md5Checksum)',
+                pageSize=LIST_PAGE_SIZE,
+                **_list_scope_kwargs()
+            ), lambda item: item.get('md5Checksum') == file_md5())
+
+        upload_kind = 'resumable' if resumable else 'single-request'
+        logger.info(f"Starting {upload_kind} upload for '{file_name}' (local: {local_file_path}) to Drive folder '{parent_drive_folder_id}'.")
+        response = _run_upload(drive_service, request, lookup, file_name, parent_drive_folder_id, http)
+        if response is None:
+            return failed
+        return (response.get('id'), response.get('md5Checksum')) if with_md5 else response.get('id')
+
+def _run_upload(drive_service, request, lookup, file_name, parent_drive_folder_id, http=None):
+    """
+    Drives an upload request to completion, chunk by chunk for resumable uploads.
 
-    logger.info(f"Starting resumable upload for '{file_name}' (local: {local_file_path}) to Drive folder '{parent_drive_folder_id}'.")
+    `lookup` is None for resumable uploads. Single-request uploads pass the
+    (lookup_request, accept) pair `_execute_create` uses to find an upload that
+    succeeded despite a failed response.
+
+    Returns:
+        dict: The `files.create` response (with the requested fields) if successful, None otherwise.
+    """
+    credentials_refreshed = False
+    last_logged_percent = -PROGRESS_LOG_STEP_PERCENT
 
     while True:
         try:
-            status, response = request.next_chunk()
+            # Transient errors (5xx, rate limits, network) are retried inside _execute_next_chunk/_execute_create
+            if lookup is None:
+                status, response = _execute_next_chunk(request, http)
+            else:
+                status, response = None, _execute_create(request, *lookup, http=http)
             if status:
-                logger.info(f"Uploaded {int(status.progress() * 100)}% for file {file_name}")
+                percent = int(status.progress() * 100)
+                if percent - last_logged_percent >= PROGRESS_LOG_STEP_PERCENT: # Not every chunk: keeps logging O(1) per file
+                    last_logged_percent = percent
+                    logger.info("Uploaded %d%% for file %s", percent, file_name)
             if response:
                 drive_file_id = response.get('id')
                 logger.info(f"File '{file_name}' uploaded successfully with ID: {drive_file_id}")
-                return drive_file_id
+                if _metadata_cache is not None:
+                    _metadata_cache.invalidate_folder(parent_drive_folder_id)
+                return response
             # If status is None and response is None, it might indicate completion in some scenarios,
             # but the google-api-python-client typically provides a response object when done.
             # The loop breaks when response is not None.
 
         except HttpError as error:
             logger.error(f"HttpError {error.resp.status} occurred during upload of {file_name}: {error}")
-            if error.resp.status in [500, 502, 503, 504]:  # Transient errors
-                retry_count += 1
-                if retry_count <= max_retries:
-                    logger.warning(f"Retrying upload for {file_name} (attempt {retry_count}/{max_retries}) in {delay} seconds...")
-                    time.sleep(delay)
-                    delay *= 2  # Exponential backoff
+            _forget_missing_parent(error, parent_drive_folder_id)
+            if error.resp.status == 401 and not credentials_refreshed:
+                # Not worth a backoff: refresh the credentials once and resume the upload
+                credentials_refreshed = True
+                if _refresh_service_credentials(drive_service):
+                    logger.warning(f"Credentials refreshed after 401. Resuming upload of {file_name}.")
                     continue
-                else:
-                    logger.error(f"Max retries exceeded for {file_name}. Upload failed.")
-                    return None
+            if _is_retryable(error):
+                logger.error(f"Retries exhausted for {file_name}. Upload failed.")
             else:  # Non-transient error
                 logger.error(f"Non-retriable error for {file_name}. Upload failed.")
-                return None
+            return None
+        except TRANSIENT_NETWORK_ERRORS as e:
+            logger.error(f"Network error persisted during upload of {file_name}: {e}. Upload failed.")
+            return None
         except Exception as e:
             logger.error(f"An unexpected error occurred during upload of {file_name}: {e}")
             return None
-    return None # Should be unreachable if loop logic is correct, but as a fallback.
+
+
+class UploadPool:
+    """
+    Bounded thread pool that uploads `UploadJob`s as they are submitted.
+
+    Each job gets its own upload driven by `upload_file`. Because `httplib2.Http`
+    is not thread-safe, every worker thread sends its uploads over a private
+    authorized HTTP transport built from the service's credentials (connections
+    are still kept alive across the chunks and files a worker uploads).
+
+    Usable as a context manager; leaving the block waits for queued uploads.
+    """
+
+    def __init__(self, drive_service, max_workers=None):
+        """
+        Args:
+            drive_service: Authorized Google Drive service instance.
+            max_workers (int, optional): Maximum number of simultaneous uploads.
+                Defaults to `[Upload] upload_concurrency`.
+        """
+        self.drive_service = drive_service
+        self.max_workers = max_workers if max_workers is not None else _upload_workers
+        self._credentials = _service_credentials(drive_service)
+        self._thread_state = threading.local()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='drivesync-upload'
+        )
+
+    def _worker_http(self):
+        if self._credentials is None:
+            return None  # Not built with an authorized transport; fall back to the service's own
+        if not hasattr(self._thread_state, 'http'):
+            self._thread_state.http = build_authorized_http(self._credentials, _http_timeout)
+        return self._thread_state.http
+
+    def _run_job(self, job, with_md5):
+        return upload_file(self.drive_service, job.local_file_path, job.file_name,
+                           job.parent_drive_folder_id, job.mime_type, http=self._worker_http(),
+                           with_md5=with_md5)
+
+    def submit(self, job, with_md5=False):
+        """
+        Queues one upload.
+
+        Args:
+            job: An `UploadJob`, or a plain
+                (local_file_path, file_name, parent_drive_folder_id[, mime_type]) tuple.
+            with_md5 (bool): Resolve to (file_id, md5Checksum), as `upload_file` does.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the uploaded Drive file ID, or None if the upload failed.
+        """
+        if not isinstance(job, UploadJob):
+            job = UploadJob(*job)
+        return self._executor.submit(self._run_job, job, with_md5)
+
+    def shutdown(self, cancel_pending=False):
+        """Waits for running uploads; uploads not yet started are dropped if `cancel_pending`."""
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(cancel_pending=exc_type is not None)
+        return False
+
+def upload_many(drive_service, jobs, max_workers=None):
+    """
+    Uploads several files concurrently using an `UploadPool`.
+
+    Args:
+        drive_service: Authorized Google Drive service instance.
+        jobs: Iterable of `UploadJob` tuples, or plain
+            (local_file_path, file_name, parent_drive_folder_id[, mime_type]) tuples.
+        max_workers (int, optional): Maximum number of simultaneous uploads.
+            Defaults to `[Upload] upload_concurrency`.
+
+    Returns:
+        dict: Maps each `UploadJob` to the uploaded Drive file ID, or None if its upload failed.
+    """
+    jobs = [job if isinstance(job, UploadJob) else UploadJob(*job) for job in jobs]
+    results = {}
+    if not jobs:
+        return results
+    if max_workers is None:
+        max_workers = _upload_workers
+
+    logger.info(f"Uploading {len(jobs)} files with up to {max_workers} concurrent uploads.")
+    with UploadPool(drive_service, max_workers) as pool:
+        futures = {pool.submit(job): job for job in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            job = futures[future]
+            try:
+                results[job] = future.result()
+            except Exception as e:
+                logger.error(f"Unexpected error uploading '{job.local_file_path}': {e}", exc_info=True)
+                results[job] = None
+            if results[job] is None:
+                logger.error(f"Upload failed for '{job.local_file_path}'.")
+
+    succeeded = sum(1 for file_id in results.values() if file_id)
+    logger.info(f"Concurrent upload finished: {succeeded}/{len(jobs)} files uploaded.")
+    return results
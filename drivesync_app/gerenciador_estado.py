@@ -1,117 +1,713 @@
 """Módulo para carregar e salvar o estado da aplicação (ex: mapeamentos de pastas, itens processados)."""
 
+import contextlib
 import json
 import logging
 import os
+import pathlib
+import sqlite3
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
-def load_state(config):
+# Default SQLite state database, used when `[Sync] state_db_file` is not set
+DEFAULT_STATE_DB_FILE = 'drivesync_state.db'
+
+# Size of the per-connection prepared statement cache. Every statement below is a
+# module constant, so each is compiled once per connection and then reused.
+STATEMENT_CACHE_SIZE = 64
+
+# The tables are only ever accessed by their TEXT primary key, so they are
+# stored WITHOUT ROWID: the rows live in the primary key B-tree itself instead
+# of in a rowid table plus a separate PK index.
+DB_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS processed_items (
+        local_relative_path TEXT PRIMARY KEY,
+        drive_id TEXT,
+        local_size INTEGER,
+        local_modified_time REAL,
+        drive_md5_checksum TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS folder_mappings (
+        local_relative_path TEXT PRIMARY KEY,
+        drive_folder_id TEXT
+    ) WITHOUT ROWID""",
+    # (st_mtime_ns, st_ino) of each local folder whose files were all in sync at the end
+    # of the last run (see `[Sync] skip_unchanged_folders` in sync_logic.run_sync)
+    """CREATE TABLE IF NOT EXISTS folder_snapshots (
+        local_relative_path TEXT PRIMARY KEY,
+        dir_mtime_ns INTEGER,
+        dir_inode INTEGER
+    ) WITHOUT ROWID""",
+)
+
+# Layout of a newly created state database: 8 KB pages fit more path-keyed rows
+# per page, and incremental auto-vacuum lets pages freed by deletions be returned
+# to the filesystem (see close_state_db). Both only take effect on an empty file.
+DB_CREATE_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA auto_vacuum=INCREMENTAL",
+)
+
+# Pages released per close_state_db call by PRAGMA incremental_vacuum
+INCREMENTAL_VACUUM_PAGES = 1000
+
+# Connection tuning applied to every state database (see initialize_state_db)
+DB_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # With WAL: durable at checkpoints, no fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+    "PRAGMA mmap_size=268435456",  # Map up to 256 MB of the database file
+    "PRAGMA wal_autocheckpoint=1000",  # Checkpoint every ~1000 pages so the WAL stays small mid-run
+)
+
+_PROCESSED_UPSERT_SQL = (
+    "INSERT OR REPLACE INTO processed_items "
+    "(local_relative_path, drive_id, local_size, local_modified_time, drive_md5_checksum) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_FOLDER_UPSERT_SQL = (
+    "INSERT OR REPLACE INTO folder_mappings (local_relative_path, drive_folder_id) VALUES (?, ?)"
+)
+_PROCESSED_SELECT_SQL = (
+    "SELECT drive_id, local_size, local_modified_time, drive_md5_checksum "
+    "FROM processed_items WHERE local_relative_path = ?"
+)
+_PROCESSED_SELECT_ALL_SQL = (
+    "SELECT local_relative_path, drive_id, local_size, local_modified_time, drive_md5_checksum FROM processed_items"
+)
+_PROCESSED_DELETE_SQL = "DELETE FROM processed_items WHERE local_relative_path = ?"
+_FOLDER_DELETE_SQL = "DELETE FROM folder_mappings WHERE local_relative_path = ?"
+_FOLDER_SELECT_SQL = "SELECT drive_folder_id FROM folder_mappings WHERE local_relative_path = ?"
+_FOLDER_SELECT_ALL_SQL = "SELECT local_relative_path, drive_folder_id FROM folder_mappings"
+_SNAPSHOT_UPSERT_SQL = (
+    "INSERT OR REPLACE INTO folder_snapshots (local_relative_path, dir_mtime_ns, dir_inode) VALUES (?, ?, ?)"
+)
+_SNAPSHOT_DELETE_SQL = "DELETE FROM folder_snapshots WHERE local_relative_path = ?"
+_SNAPSHOT_SELECT_ALL_SQL = "SELECT local_relative_path, dir_mtime_ns, dir_inode FROM folder_snapshots"
+
+def _configure_connection(conn, db_path):
+    """
+    Applies the journal mode and performance PRAGMAs to a state database connection.
+
+    WAL turns each commit into a sequential append to the write-ahead log and
+    lets readers proceed while a write is in progress. In-memory databases
+    cannot use WAL and are left in their default mode.
     """
-    Loads the application's synchronization state from a JSON file.
+    if db_path != ':memory:' and not db_path.startswith('file::memory:'):
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if str(journal_mode).lower() != 'wal':
+            # SQLite declines WAL on some filesystems (e.g. network shares)
+            logger.warning("SQLite kept journal mode '%s' for state database '%s' instead of WAL.", journal_mode, db_path)
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+
+def _state_db_path(config):
+    """Returns the state database path configured in `[Sync] state_db_file`."""
+    return config.get('Sync', 'state_db_file', fallback=DEFAULT_STATE_DB_FILE) or DEFAULT_STATE_DB_FILE
 
-    The path to this state file is retrieved from the `state_file` key
-    within the `[Sync]` section of the `config.ini` file.
+def initialize_state_db(config):
+    """
+    Opens (creating if needed) the SQLite state database.
+
+    The database path is read from `state_db_file` in the `[Sync]` section
+    (default `drivesync_state.db`). Tables are created if they don't exist, and
+    the connection is switched to WAL with `synchronous=NORMAL`.
+
+    When the sqlite3 module is built in serialized mode (`sqlite3.threadsafety == 3`),
+    the connection may be shared with worker threads: their writes simply join
+    the current batch, and SQLite serializes the calls.
 
     Args:
-        config: The application's loaded configuration object (assumed to be a configparser.ConfigParser instance).
+        config: The application's loaded configuration object (a configparser.ConfigParser instance).
+
+    Returns:
+        sqlite3.Connection: The open connection, or None if the database could not be opened.
+    """
+    db_path = _state_db_path(config)
+    try:
+        pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.error("Could not create directory for state database '%s': %s", db_path, e)
+        return None
+
+    try:
+        conn = sqlite3.connect(
+            db_path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=sqlite3.threadsafety != 3
+        )
+        if conn.execute("SELECT count(*) FROM sqlite_master").fetchone()[0] == 0:
+            for pragma in DB_CREATE_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute("VACUUM")  # Rewrites the (empty) file with the new layout
+        _configure_connection(conn, db_path)
+        with conn:
+            for statement in DB_SCHEMA:
+                conn.execute(statement)
+        logger.info("State database ready at '%s'.", db_path)
+        return conn
+    except sqlite3.Error as e:
+        logger.error("SQLite error initializing state database '%s': %s", db_path, e)
+        return None
+
+def open_state_db_readonly(config):
+    """
+    Opens the configured state database read-only, for scans such as verification.
+
+    The connection uses a `mode=ro` URI, so it never takes the write lock; under
+    WAL it reads a consistent snapshot while another connection keeps writing.
+    Writes must go through the connection returned by `initialize_state_db`.
 
     Returns:
-        A dictionary representing the loaded state. If the file doesn't exist
-        or is invalid, returns a default empty state:
-        `{"processed_items": {}, "folder_mappings": {}}`.
+        sqlite3.Connection: The read-only connection, or None if the database does
+        not exist or cannot be opened.
+    """
+    db_path = _state_db_path(config)
+    if not os.path.exists(db_path):
+        logger.info("State database '%s' not found; nothing to open read-only.", db_path)
+        return None
+    try:
+        uri = pathlib.Path(db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    except sqlite3.Error as e:
+        logger.error("SQLite error opening state database '%s' read-only: %s", db_path, e)
+        return None
+
+def close_state_db(db_connection):
+    """
+    Closes a state database connection, leaving the files compact for the next run.
+
+    `incremental_vacuum` returns up to INCREMENTAL_VACUUM_PAGES free pages to the
+    filesystem (a no-op on databases created without incremental auto-vacuum),
+    `PRAGMA optimize` lets SQLite refresh planner statistics gathered during the
+    run, and `wal_checkpoint(TRUNCATE)` copies the WAL back into the database
+    and truncates it. Failures of any of these are logged; the connection is
+    closed regardless.
     """
-    default_state = {"processed_items": {}, "folder_mappings": {}}
-    state_file_path = None
+    # execute() steps a statement once, which frees a single page; executescript runs
+    # incremental_vacuum to completion (committing a batch left open, which closing would lose)
+    close_steps = (
+        (db_connection.executescript, f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})"),
+        (db_connection.execute, "PRAGMA optimize"),
+        (db_connection.execute, "PRAGMA wal_checkpoint(TRUNCATE)"),
+    )
+    for run, pragma in close_steps:
+        try:
+            run(pragma)
+        except sqlite3.Error as e:
+            logger.warning("SQLite error running '%s' before closing the state database: %s", pragma, e)
     try:
-        # Assuming config is a configparser.ConfigParser object
-        state_file_path = config['Sync']['state_file']
-    except KeyError:
-        logger.error("Key 'state_file' not found in section '[Sync]' of the configuration.")
-        return default_state
-    except Exception as e:
-        logger.error(f"Error retrieving 'state_file' from configuration: {e}")
-        return default_state
+        db_connection.close()
+    except sqlite3.Error as e:
+        logger.error("SQLite error closing the state database: %s", e)
 
-    if not state_file_path:
-        # This case might be redundant if configparser itself raises an error for empty values,
-        # but kept for robustness.
-        logger.error("'state_file' is not defined or is empty in the [Sync] section of the configuration.")
-        return default_state
+def begin_batch(db_connection):
+    """
+    Opens a write transaction grouping the following `update_*`/`remove_*` calls.
+
+    The single-row writers only execute their statement; nothing is durable
+    until `commit_batch` is called, so a whole sync run (or a large part of it)
+    costs one commit instead of one per file.
 
+    Returns:
+        bool: True if the transaction was started, False otherwise.
+    """
+    if db_connection.in_transaction:
+        return True
+    try:
+        db_connection.execute("BEGIN IMMEDIATE")
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error starting a write batch: %s", e)
+        return False
+
+def commit_batch(db_connection):
+    """
+    Commits the current write transaction. On failure it is rolled back.
+
+    Returns:
+        bool: True on success, False otherwise.
+    """
+    try:
+        db_connection.commit()
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error committing a write batch: %s", e)
+        try:
+            db_connection.rollback()
+        except sqlite3.Error:
+            pass
+        return False
+
+def get_processed_item(db_connection, relative_path):
+    """
+    Retrieves the stored state of a processed file.
+
+    Returns:
+        dict: {'drive_id', 'local_size', 'local_modified_time', 'drive_md5_checksum'},
+        or None if the file is not recorded (or on error).
+    """
+    try:
+        row = db_connection.execute(_PROCESSED_SELECT_SQL, (relative_path,)).fetchone()
+    except sqlite3.Error as e:
+        logger.error("SQLite error retrieving processed item '%s': %s", relative_path, e)
+        return None
+    if row is None:
+        return None
+    return {'drive_id': row[0], 'local_size': row[1], 'local_modified_time': row[2], 'drive_md5_checksum': row[3]}
+
+def update_processed_item(db_connection, item_details):
+    """
+    Inserts or replaces the state of a processed file.
+
+    The write is part of the current transaction and becomes durable on the
+    next `commit_batch`.
+
+    Args:
+        db_connection (sqlite3.Connection): Open state database connection.
+        item_details (dict): Must contain 'local_relative_path'; may contain 'drive_id',
+            'local_size', 'local_modified_time' and 'drive_md5_checksum'.
+
+    Returns:
+        bool: True on success, False otherwise.
+    """
+    relative_path = item_details.get('local_relative_path')
+    row = (
+        item_details.get('drive_id'),
+        item_details.get('local_size'),
+        item_details.get('local_modified_time'),
+        item_details.get('drive_md5_checksum'),
+    )
+    try:
+        db_connection.execute(_PROCESSED_UPSERT_SQL, (relative_path,) + row)
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error updating processed item '%s': %s", relative_path, e)
+        return False
+
+def remove_processed_item(db_connection, relative_path):
+    """Deletes the stored state of a processed file (until the next `commit_batch`). Returns True on success, False otherwise."""
+    try:
+        db_connection.execute(_PROCESSED_DELETE_SQL, (relative_path,))
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error removing processed item '%s': %s", relative_path, e)
+        return False
+
+def get_folder_mapping(db_connection, relative_path):
+    """Returns the Drive folder ID mapped to a local relative folder path, or None."""
+    try:
+        row = db_connection.execute(_FOLDER_SELECT_SQL, (relative_path,)).fetchone()
+    except sqlite3.Error as e:
+        logger.error("SQLite error retrieving folder mapping '%s': %s", relative_path, e)
+        return None
+    return row[0] if row is not None else None
+
+def update_folder_mapping(db_connection, mapping_details):
+    """
+    Inserts or replaces a folder mapping, as part of the current transaction.
+
+    Args:
+        db_connection (sqlite3.Connection): Open state database connection.
+        mapping_details (dict): {'local_relative_path': ..., 'drive_folder_id': ...}.
+
+    Returns:
+        bool: True on success, False otherwise.
+    """
+    relative_path = mapping_details.get('local_relative_path')
+    folder_id = mapping_details.get('drive_folder_id')
+    try:
+        db_connection.execute(_FOLDER_UPSERT_SQL, (relative_path, folder_id))
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error updating folder mapping '%s': %s", relative_path, e)
+        return False
+
+def _executemany_in_transaction(db_connection, sql, rows, description):
+    """Runs one `executemany` and commits it, unless the caller already has a batch open."""
+    try:
+        if db_connection.in_transaction:
+            db_connection.executemany(sql, rows)
+        else:
+            with db_connection:
+                db_connection.executemany(sql, rows)
+        return True
+    except sqlite3.Error as e:
+        logger.error("SQLite error in bulk update of %s: %s", description, e)
+        return False
+
+def update_processed_items_bulk(db_connection, items):
+    """
+    Inserts or replaces many processed items with a single `executemany`.
+
+    Args:
+        db_connection (sqlite3.Connection): Open state database connection.
+        items: Iterable of dicts in the format accepted by `update_processed_item`.
+
+    Returns:
+        bool: True on success, False otherwise. The rows are committed immediately
+        unless a batch opened with `begin_batch` is in progress.
+    """
+    rows = ((d.get('local_relative_path'), d.get('drive_id'), d.get('local_size'),
+             d.get('local_modified_time'), d.get('drive_md5_checksum')) for d in items)
+    return _executemany_in_transaction(db_connection, _PROCESSED_UPSERT_SQL, rows, 'processed items')
+
+def update_folder_mappings_bulk(db_connection, mappings):
+    """
+    Inserts or replaces many folder mappings with a single `executemany`.
+
+    Args:
+        db_connection (sqlite3.Connection): Open state database connection.
+        mappings: Iterable of dicts in the format accepted by `update_folder_mapping`.
+
+    Returns:
+        bool: True on success, False otherwise (committed as in `update_processed_items_bulk`).
+    """
+    rows = ((d.get('local_relative_path'), d.get('drive_folder_id')) for d in mappings)
+    return _executemany_in_transaction(db_connection, _FOLDER_UPSERT_SQL, rows, 'folder mappings')
+
+def remove_processed_items_bulk(db_connection, relative_paths):
+    """Deletes the stored state of many files with a single `executemany` (committed as in `update_processed_items_bulk`)."""
+    rows = ((relative_path,) for relative_path in relative_paths)
+    return _executemany_in_transaction(db_connection, _PROCESSED_DELETE_SQL, rows, 'processed items')
+
+def remove_folder_mappings_bulk(db_connection, relative_paths):
+    """Deletes many folder mappings with a single `executemany` (committed as in `update_processed_items_bulk`)."""
+    rows = ((relative_path,) for relative_path in relative_paths)
+    return _executemany_in_transaction(db_connection, _FOLDER_DELETE_SQL, rows, 'folder mappings')
+
+def update_folder_snapshots_bulk(db_connection, snapshots):
+    """
+    Inserts or replaces many folder snapshots with a single `executemany`.
+
+    Args:
+        db_connection (sqlite3.Connection): Open state database connection.
+        snapshots: Iterable of (relative_path, (dir_mtime_ns, dir_inode)) pairs.
+
+    Returns:
+        bool: True on success, False otherwise (committed as in `update_processed_items_bulk`).
+    """
+    rows = ((relative_path, mtime_ns, inode) for relative_path, (mtime_ns, inode) in snapshots)
+    return _executemany_in_transaction(db_connection, _SNAPSHOT_UPSERT_SQL, rows, 'folder snapshots')
+
+def remove_folder_snapshots_bulk(db_connection, relative_paths):
+    """Deletes many folder snapshots with a single `executemany` (committed as in `update_processed_items_bulk`)."""
+    rows = ((relative_path,) for relative_path in relative_paths)
+    return _executemany_in_transaction(db_connection, _SNAPSHOT_DELETE_SQL, rows, 'folder snapshots')
+
+def get_all_processed_items(db_connection):
+    """Returns every processed item as {relative_path: {...}}, in the format of `get_processed_item`."""
+    try:
+        # Rows are streamed from the cursor straight into the dict, without an intermediate list
+        return {
+            row[0]: {'drive_id': row[1], 'local_size': row[2], 'local_modified_time': row[3], 'drive_md5_checksum': row[4]}
+            for row in db_connection.execute(_PROCESSED_SELECT_ALL_SQL)
+        }
+    except sqlite3.Error as e:
+        logger.error("SQLite error retrieving processed items: %s", e)
+        return {}
+
+def get_all_folder_mappings(db_connection):
+    """Returns every folder mapping as {relative_path: drive_folder_id}."""
+    try:
+        return dict(db_connection.execute(_FOLDER_SELECT_ALL_SQL))
+    except sqlite3.Error as e:
+        logger.error("SQLite error retrieving folder mappings: %s", e)
+        return {}
+
+def get_all_folder_snapshots(db_connection):
+    """Returns every folder snapshot as {relative_path: (dir_mtime_ns, dir_inode)}."""
+    try:
+        return {row[0]: (row[1], row[2]) for row in db_connection.execute(_SNAPSHOT_SELECT_ALL_SQL)}
+    except sqlite3.Error as e:
+        logger.error("SQLite error retrieving folder snapshots: %s", e)
+        return {}
+
+def load_state_snapshot(db_connection):
+    """
+    Reads the whole state with one table scan per table.
+
+    Meant for loops that check every local file: looking paths up in the
+    returned dicts avoids one SELECT per file. The snapshot is not kept in
+    sync with the database; write changes through the `update_*`/`remove_*`
+    functions (and update the dicts alongside) or take a new snapshot at the
+    next phase boundary.
+
+    Returns:
+        tuple: (processed_by_path, folder_by_path), as returned by
+        `get_all_processed_items` and `get_all_folder_mappings`.
+    """
+    return get_all_processed_items(db_connection), get_all_folder_mappings(db_connection)
+
+# Connections and last loaded/saved state opened by load_state/save_state, keyed by
+# database path, so save_state only writes the rows that changed since.
+_state_connections = {}
+_state_snapshots = {}
+
+def _state_connection(config):
+    """Returns the connection used by load_state/save_state for the configured database, opening it once."""
+    db_path = _state_db_path(config)
+    conn = _state_connections.get(db_path)
+    if conn is None:
+        conn = initialize_state_db(config)
+        if conn is not None:
+            _state_connections[db_path] = conn
+    return conn
+
+def _import_legacy_state_file(db_connection, config):
+    """
+    Imports the JSON state file used by earlier versions into an empty state database.
+
+    The path comes from `state_file` in the `[Sync]` section. The file is only read,
+    never rewritten; it can be removed once the import has been logged.
+
+    Returns:
+        bool: True if rows were imported, False otherwise.
+    """
+    state_file_path = config.get('Sync', 'state_file', fallback=None)
+    if not state_file_path or not os.path.exists(state_file_path):
+        return False
     try:
         with open(state_file_path, 'r') as f:
             state_data = json.load(f)
-            if not isinstance(state_data, dict):
-                logger.error(f"State file {state_file_path} does not contain a valid JSON dictionary. Returning default state.")
-                return default_state
-            # Ensure essential keys are present
-            if "processed_items" not in state_data:
-                logger.warning(f"'processed_items' key not found in state file {state_file_path}. Initializing with empty dict.")
-                state_data["processed_items"] = {}
-            if "folder_mappings" not in state_data:
-                logger.warning(f"'folder_mappings' key not found in state file {state_file_path}. Initializing with empty dict.")
-                state_data["folder_mappings"] = {}
-            logger.info(f"Successfully loaded state from {state_file_path}")
-            return state_data
-    except FileNotFoundError:
-        logger.info(f"State file {state_file_path} not found. Returning default empty state.")
-        return default_state
-    except json.JSONDecodeError:
-        logger.error(f"Error decoding JSON from state file {state_file_path}. The file might be empty or corrupted. Returning default state.")
-        return default_state
-    except Exception as e:
-        logger.error(f"An unexpected error occurred while loading state from {state_file_path}: {e}")
-        return default_state
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error("Could not read legacy state file %s for import: %s", state_file_path, e)
+        return False
+    if not isinstance(state_data, dict):
+        logger.error("Legacy state file %s does not contain a valid JSON dictionary. Not imported.", state_file_path)
+        return False
+
+    processed = state_data.get('processed_items') or {}
+    folders = state_data.get('folder_mappings') or {}
+    begin_batch(db_connection)
+    ok = (
+        update_processed_items_bulk(db_connection, (dict(d, local_relative_path=p) for p, d in processed.items()))
+        and update_folder_mappings_bulk(
+            db_connection, ({'local_relative_path': p, 'drive_folder_id': f} for p, f in folders.items())
+        )
+    )
+    if ok and commit_batch(db_connection):
+        logger.info("Imported %d processed items and %d folder mappings from legacy state file %s.",
+                    len(processed), len(folders), state_file_path)
+        return True
+    db_connection.rollback()
+    return False
+
+def load_state(config):
+    """
+    Loads the application's synchronization state from the SQLite state database.
+
+    The database is opened with `initialize_state_db` (`state_db_file` in the
+    `[Sync]` section). If it is empty and the JSON file named by `state_file`
+    exists, that file is imported first. A copy of the loaded state is kept so
+    that `save_state` only writes what changed.
+
+    Args:
+        config: The application's loaded configuration object (assumed to be a configparser.ConfigParser instance).
+
+    Returns:
+        A dictionary `{"processed_items": {...}, "folder_mappings": {...}, "folder_snapshots": {...}}`
+        (see `get_all_folder_snapshots` for the last one). If the database cannot be
+        opened, all dicts are empty.
+    """
+    conn = _state_connection(config)
+    if conn is None:
+        return {"processed_items": {}, "folder_mappings": {}, "folder_snapshots": {}}
+
+    processed, folders = load_state_snapshot(conn)
+    if not processed and not folders and _import_legacy_state_file(conn, config):
+        processed, folders = load_state_snapshot(conn)
+    dir_snapshots = get_all_folder_snapshots(conn)
+
+    _state_snapshots[_state_db_path(config)] = (
+        {p: dict(d) for p, d in processed.items()}, dict(folders), dict(dir_snapshots)
+    )
+    logger.info("Successfully loaded state from %s", _state_db_path(config))
+    return {"processed_items": processed, "folder_mappings": folders, "folder_snapshots": dir_snapshots}
+
+def load_state_readonly(config):
+    """
+    Loads the state like `load_state`, through a short-lived read-only connection.
+
+    Meant for runs that only read the state (e.g. `--verify`): no write lock is
+    taken, so it can run while another process is syncing. The result is not
+    meant to be passed to `save_state`.
+
+    Returns:
+        A dictionary `{"processed_items": {...}, "folder_mappings": {...}, "folder_snapshots": {...}}`;
+        all dicts are empty if the database cannot be opened.
+    """
+    conn = open_state_db_readonly(config)
+    if conn is None:
+        return {"processed_items": {}, "folder_mappings": {}, "folder_snapshots": {}}
+    try:
+        processed, folders = load_state_snapshot(conn)
+        dir_snapshots = get_all_folder_snapshots(conn)
+    finally:
+        conn.close()
+    logger.info("Successfully loaded state (read-only) from %s", _state_db_path(config))
+    return {"processed_items": processed, "folder_mappings": folders, "folder_snapshots": dir_snapshots}
 
 def save_state(config, state_data):
     """
-    Saves the application's synchronization state to a JSON file.
+    Saves the application's synchronization state to the SQLite state database.
 
-    The path to this state file is retrieved from the `state_file` key
-    within the `[Sync]` section of the `config.ini` file.
-    The save operation is performed atomically.
+    Only entries added, changed or removed since the last `load_state`/`save_state`
+    are written, with bulk statements inside a single transaction; if nothing
+    changed, no transaction is opened at all.
 
     Args:
         config: The application's loaded configuration object (assumed to be a configparser.ConfigParser instance).
-        state_data: The Python dictionary (state) to be saved.
+        state_data: The state dictionary, as returned by `load_state`.
 
     Returns:
         True if saving was successful, False otherwise.
     """
-    state_file_path = None
-    try:
-        # Assuming config is a configparser.ConfigParser object
-        state_file_path = config['Sync']['state_file']
-    except KeyError:
-        logger.error("Key 'state_file' not found in section '[Sync]' of the configuration.")
+    conn = _state_connection(config)
+    if conn is None:
         return False
-    except Exception as e:
-        logger.error(f"Error retrieving 'state_file' from configuration: {e}")
+
+    db_path = _state_db_path(config)
+    old_processed, old_folders, old_dir_snapshots = _state_snapshots.get(db_path, ({}, {}, {}))
+    processed = state_data.get('processed_items', {})
+    folders = state_data.get('folder_mappings', {})
+    # Left as loaded when the caller's dict has no 'folder_snapshots' key
+    dir_snapshots = state_data.get('folder_snapshots', old_dir_snapshots)
+
+    changed_items = [dict(d, local_relative_path=p) for p, d in processed.items() if old_processed.get(p) != d]
+    removed_items = [p for p in old_processed if p not in processed]
+    changed_folders = [
+        {'local_relative_path': p, 'drive_folder_id': f} for p, f in folders.items() if old_folders.get(p) != f
+    ]
+    removed_folders = [p for p in old_folders if p not in folders]
+    changed_dir_snapshots = [(p, snap) for p, snap in dir_snapshots.items() if old_dir_snapshots.get(p) != snap]
+    removed_dir_snapshots = [p for p in old_dir_snapshots if p not in dir_snapshots]
+
+    if not (changed_items or removed_items or changed_folders or removed_folders
+            or changed_dir_snapshots or removed_dir_snapshots):
+        logger.info("State unchanged since last load/save; nothing written to %s", db_path)
+        return True
+
+    if not begin_batch(conn):
+        return False
+    ok = (
+        update_processed_items_bulk(conn, changed_items)
+        and update_folder_mappings_bulk(conn, changed_folders)
+        and remove_processed_items_bulk(conn, removed_items)
+        and remove_folder_mappings_bulk(conn, removed_folders)
+        and update_folder_snapshots_bulk(conn, changed_dir_snapshots)
+        and remove_folder_snapshots_bulk(conn, removed_dir_snapshots)
+    )
+    if not ok:
+        conn.rollback()
         return False
+    if not commit_batch(conn):
+        return False
+
+    _state_snapshots[db_path] = ({p: dict(d) for p, d in processed.items()}, dict(folders), dict(dir_snapshots))
+    logger.info(
+        "Successfully saved state to %s (%d items, %d folder mappings and %d folder snapshots written, %d removed)",
+        db_path, len(changed_items), len(changed_folders), len(changed_dir_snapshots),
+        len(removed_items) + len(removed_folders) + len(removed_dir_snapshots)
+    )
+    return True
 
-    if not state_file_path:
-        # This case might be redundant if configparser itself raises an error for empty values,
-        # but kept for robustness.
-        logger.error("'state_file' is not defined or is empty in the [Sync] section of the configuration.")
+def save_state_changes(config, state_data, processed_paths=(), folder_paths=()):
+    """
+    Writes only the given entries of the state, e.g. for a checkpoint in the middle of a run.
+
+    Unlike `save_state`, the rest of the state is not compared, so the cost
+    depends on the number of paths given, not on the size of the state. Paths
+    no longer present in `state_data` are removed. The copy kept by
+    `load_state` is updated for these paths, so a later `save_state` does not
+    write them again.
+
+    Args:
+        config: The application's loaded configuration object.
+        state_data: The state dictionary, as returned by `load_state`.
+        processed_paths: Relative paths of the `processed_items` entries to write.
+        folder_paths: Relative paths of the `folder_mappings` entries to write.
+
+    Returns:
+        True if saving was successful, False otherwise.
+    """
+    conn = _state_connection(config)
+    if conn is None:
         return False
 
-    temp_file_path = state_file_path + ".tmp"
+    db_path = _state_db_path(config)
+    old_processed, old_folders, _ = _state_snapshots.setdefault(db_path, ({}, {}, {}))
+    processed = state_data.get('processed_items', {})
+    folders = state_data.get('folder_mappings', {})
 
-    try:
-        with open(temp_file_path, 'w') as f:
-            json.dump(state_data, f, indent=4)
-        # Atomically move the temporary file to the actual state file path
-        os.replace(temp_file_path, state_file_path)
-        logger.info(f"Successfully saved state to {state_file_path}")
+    changed_items = [dict(processed[p], local_relative_path=p) for p in processed_paths if p in processed]
+    removed_items = [p for p in processed_paths if p not in processed]
+    changed_folders = [{'local_relative_path': p, 'drive_folder_id': folders[p]} for p in folder_paths if p in folders]
+    removed_folders = [p for p in folder_paths if p not in folders]
+    if not (changed_items or removed_items or changed_folders or removed_folders):
         return True
-    except Exception as e:
-        logger.error(f"An error occurred while saving state to {state_file_path}: {e}")
-        # Clean up the temporary file if it exists and an error occurred
-        if os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception as remove_e:
-                logger.error(f"Error cleaning up temporary state file {temp_file_path}: {remove_e}")
+
+    if not begin_batch(conn):
+        return False
+    ok = (
+        update_processed_items_bulk(conn, changed_items)
+        and update_folder_mappings_bulk(conn, changed_folders)
+        and remove_processed_items_bulk(conn, removed_items)
+        and remove_folder_mappings_bulk(conn, removed_folders)
+    )
+    if not ok:
+        conn.rollback()
         return False
+    if not commit_batch(conn):
+        return False
+
+    for p in processed_paths:
+        if p in processed:
+            old_processed[p] = dict(processed[p])
+        else:
+            old_processed.pop(p, None)
+    for p in folder_paths:
+        if p in folders:
+            old_folders[p] = folders[p]
+        else:
+            old_folders.pop(p, None)
+    logger.info("Saved state changes to %s (%d items and %d folder mappings written, %d removed)",
+                db_path, len(changed_items), len(changed_folders), len(removed_items) + len(removed_folders))
+    return True
+
+def close_state(config):
+    """Closes the state database opened by `load_state`/`save_state` (see `close_state_db`). Safe to call if it was never opened."""
+    db_path = _state_db_path(config)
+    _state_snapshots.pop(db_path, None)
+    conn = _state_connections.pop(db_path, None)
+    if conn is not None:
+        close_state_db(conn)
+
+@contextlib.contextmanager
+def app_state(config, read_only=False, persist=True):
+    """
+    Loads the application state for the duration of a `with` block.
+
+    On entry the state is loaded with `load_state` (or `load_state_readonly` if
+    `read_only`). When the block exits normally the state is saved with
+    `save_state`, which writes only what changed, unless `read_only` is set or
+    `persist` is False (e.g. a dry run). The state database is closed on every
+    exit, including when the block raises.
+
+    Args:
+        config: The application's loaded configuration object.
+        read_only (bool): Open the state read-only; nothing is ever saved.
+        persist (bool): Save the state when the block completes.
+
+    Yields:
+        dict: The state dictionary, as returned by `load_state`.
+    """
+    state = load_state_readonly(config) if read_only else load_state(config)
+    try:
+        yield state
+        if persist and not read_only and not save_state(config, state):
+            logger.error("Failed to save the application state")
+    finally:
+        close_state(config)
@@ -1,7 +1,17 @@
 """Módulo para configuração do logger."""
 
 import logging
+import logging.handlers
 import configparser
+import queue
+
+# Defaults for the rotating log file (`log_max_mb` / `log_backup_count` in `[Logging]`)
+DEFAULT_LOG_MAX_MB = 10
+DEFAULT_LOG_BACKUP_COUNT = 5
+
+# Listener started by the last setup_logger call; handlers it installed on the root
+# logger carry a `_drivesync` attribute so a later call can replace them.
+_listener = None
 
 def setup_logger(config: configparser.ConfigParser):
     """
@@ -9,7 +19,10 @@ def setup_logger(config: configparser.ConfigParser):
     `[Logging]` section of the `config` object.
 
     It sets up:
-    - A file handler to write logs to a specified file (`log_file`).
+    - A rotating file handler writing to `log_file`, rolled over at `log_max_mb`
+      megabytes with `log_backup_count` old files kept. It is driven by a
+      `QueueListener` thread; the root logger only gets a `QueueHandler`, so
+      logging calls enqueue the record instead of writing to disk.
     - A console handler to output logs to the standard stream.
     - The logging level (`log_level`) for both handlers.
     - A common log message format.
@@ -17,12 +30,25 @@ def setup_logger(config: configparser.ConfigParser):
     If logging settings are missing in the `config`, it uses default fallbacks
     (e.g., 'drivesync.log' for file path, 'INFO' for log level).
 
+    Calling it again replaces the handlers and listener installed by the
+    previous call instead of adding a second set, so no line is written twice.
+
     Args:
         config (configparser.ConfigParser): ConfigParser instance, expected to
             contain a `[Logging]` section with `log_file` and `log_level` options.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener; call `.stop()` at
+        shutdown to flush pending records to the log file.
     """
     log_file_path = config.get('Logging', 'log_file', fallback='drivesync.log')
     log_level_str = config.get('Logging', 'log_level', fallback='INFO').upper()
+    try:
+        max_bytes = int(config.getfloat('Logging', 'log_max_mb', fallback=DEFAULT_LOG_MAX_MB) * 1024 * 1024)
+        backup_count = config.getint('Logging', 'log_backup_count', fallback=DEFAULT_LOG_BACKUP_COUNT)
+    except ValueError:
+        max_bytes = DEFAULT_LOG_MAX_MB * 1024 * 1024
+        backup_count = DEFAULT_LOG_BACKUP_COUNT
 
     # Get the numeric log level
     numeric_log_level = getattr(logging, log_level_str, logging.INFO)
@@ -31,22 +57,38 @@ def setup_logger(config: configparser.ConfigParser):
     logger = logging.getLogger()
     logger.setLevel(numeric_log_level)
 
+    # Drop what a previous call installed
+    global _listener
+    for handler in [h for h in logger.handlers if getattr(h, '_drivesync', False)]:
+        logger.removeHandler(handler)
+        handler.close()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
     # Create a formatter
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    # Create a file handler
-    file_handler = logging.FileHandler(log_file_path)
+    # Create a rotating file handler, fed from a queue by a listener thread
+    file_handler = logging.handlers.RotatingFileHandler(log_file_path, maxBytes=max_bytes, backupCount=backup_count)
     file_handler.setLevel(numeric_log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler._drivesync = True
+    logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
 
     # Create a console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(numeric_log_level)
     console_handler.setFormatter(formatter)
+    console_handler._drivesync = True
     logger.addHandler(console_handler)
 
     logging.info("Logger configured: File output to %s, Level: %s", log_file_path, log_level_str)
+    return _listener
 
 if __name__ == '__main__':
     # Example usage (for testing purposes)
@@ -59,13 +101,14 @@ log_level = DEBUG
     config_parser = configparser.ConfigParser()
     config_parser.read_string(dummy_config_content)
 
-    setup_logger(config_parser)
+    log_listener = setup_logger(config_parser)
 
     logging.debug("This is a debug message.")
     logging.info("This is an info message.")
     logging.warning("This is a warning message.")
     logging.error("This is an error message.")
     logging.critical("This is a critical message.")
+    log_listener.stop()
 
     # Example of how another module would get the logger
     # test_logger = logging.getLogger(__name__)
@@ -0,0 +1,161 @@
+"""Módulo para cache persistente (SQLite) de metadados de pastas e arquivos do Google Drive."""
+
+import collections
+import logging
+import sqlite3
+import threading
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+CACHE_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS folder_children (
+        parent_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        id TEXT NOT NULL,
+        mime TEXT,
+        md5 TEXT,
+        mtime TEXT,
+        size INTEGER,
+        PRIMARY KEY (parent_id, name)
+    )""",
+    # One row per parent whose full listing is cached; listed_at is the RFC 3339
+    # timestamp used as the lower bound of the next delta query.
+    """CREATE TABLE IF NOT EXISTS folder_listings (
+        parent_id TEXT PRIMARY KEY,
+        listed_at TEXT NOT NULL
+    )""",
+)
+
+class DriveItem(collections.namedtuple('DriveItem', 'id mimeType md5Checksum modifiedTime size',
+                                       defaults=(None, None, None))):
+    """
+    Immutable record of one Drive item in a folder listing.
+
+    Listings of large folders hold thousands of these, so a namedtuple is used
+    instead of a per-item dict (roughly a third of the memory, and attribute
+    access is cheaper than a key lookup).
+    """
+
+    __slots__ = ()
+
+class MetadataCache:
+    """
+    SQLite-backed cache of Drive folder children that survives across runs.
+
+    Rows are keyed by (parent_id, name). A parent is considered "listed" once a
+    full `files.list` of it has been stored; later listings only need to fetch
+    items modified after `listed_at`. Writes performed by this application in a
+    folder invalidate that folder's listing so the next one is complete again.
+
+    The connection is shared between threads and protected by a lock.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in CACHE_SCHEMA:
+            self._conn.execute(statement)
+        logger.info(f"Metadata cache opened at '{db_path}'.")
+
+    def get_child(self, parent_id, name):
+        """
+        Returns the cached child of `parent_id` named `name`.
+
+        Returns:
+            DriveItem: The cached item, or None if not cached.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, mime, md5, mtime, size FROM folder_children WHERE parent_id = ? AND name = ?",
+                (parent_id, name)
+            ).fetchone()
+        if row is None:
+            return None
+        return DriveItem(*row)
+
+    def get_listing(self, parent_id):
+        """
+        Returns the cached listing of a folder.
+
+        Returns:
+            tuple: (contents, listed_at), where `contents` uses the same format as
+            `gerenciador_drive.list_folder_contents`, or None if the folder has no
+            complete cached listing.
+        """
+        with self._lock:
+            stamp = self._conn.execute(
+                "SELECT listed_at FROM folder_listings WHERE parent_id = ?", (parent_id,)
+            ).fetchone()
+            if stamp is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT name, id, mime, md5, mtime, size FROM folder_children WHERE parent_id = ?", (parent_id,)
+            ).fetchall()
+        contents = {
+            name: DriveItem(item_id, mime, md5, mtime, size)
+            for name, item_id, mime, md5, mtime, size in rows
+        }
+        return contents, stamp[0]
+
+    def store_children(self, parent_id, contents, listed_at=None, replace=False):
+        """
+        Upserts children of a folder.
+
+        Args:
+            parent_id (str): Drive ID of the parent folder.
+            contents (dict): Name-keyed `DriveItem`s, as returned by `list_folder_contents`.
+            listed_at (str, optional): If given, marks the folder as fully listed up to
+                this RFC 3339 timestamp.
+            replace (bool): If True, existing children of the folder are dropped first
+                (used when `contents` is a complete listing).
+        """
+        rows = [
+            (parent_id, name, d.id, d.mimeType, d.md5Checksum, d.modifiedTime, d.size)
+            for name, d in contents.items()
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if replace:
+                    self._conn.execute("DELETE FROM folder_children WHERE parent_id = ?", (parent_id,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO folder_children (parent_id, name, id, mime, md5, mtime, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                if listed_at is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO folder_listings (parent_id, listed_at) VALUES (?, ?)",
+                        (parent_id, listed_at)
+                    )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.error(f"SQLite error storing cached children of folder '{parent_id}': {e}")
+
+    def invalidate_folder(self, parent_id):
+        """Forgets that `parent_id` is fully listed, forcing the next listing to be complete."""
+        with self._lock:
+            self._conn.execute("DELETE FROM folder_listings WHERE parent_id = ?", (parent_id,))
+
+    def forget_folder(self, folder_id):
+        """Drops every row referring to `folder_id`, as a parent or as a child."""
+        with self._lock:
+            self._conn.execute("DELETE FROM folder_listings WHERE parent_id = ?", (folder_id,))
+            self._conn.execute("DELETE FROM folder_children WHERE parent_id = ? OR id = ?", (folder_id, folder_id))
+
+    def clear(self):
+        """Empties the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM folder_listings")
+            self._conn.execute("DELETE FROM folder_children")
+
+    def close(self):
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
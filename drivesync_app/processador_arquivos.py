@@ -1,89 +1,278 @@
 """Módulo para processamento de arquivos e diretórios locais."""
 
+import collections
 import os
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
-def walk_local_directory(local_folder_path_str: str):
+# Default number of threads stat'ing the files of a directory (`[Sync] stat_threads`)
+DEFAULT_STAT_THREADS = 16
+
+# Pool shared by every walk (and every directory of a walk), created on first use
+_stat_executor = None
+_stat_executor_workers = 0
+_stat_executor_lock = threading.Lock()
+
+# Items a background walk (see `walk_in_background`) may run ahead of its consumer
+WALK_QUEUE_SIZE = 1024
+# How often (seconds) a background walk blocked on a full queue checks whether it was abandoned
+_WALK_PUT_POLL_SECONDS = 0.1
+_WALK_DONE = object()
+
+# Whether directories can be scanned through an fd (POSIX), making DirEntry.stat() use fstatat
+_SCANDIR_FD = os.scandir in os.supports_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+# Items yielded by `walk_local_directory`, one per file and folder: namedtuples instead of
+# per-item dicts (a fraction of the memory, and attribute access is cheaper than a key
+# lookup), told apart by their class-level `type`
+class FolderItem(collections.namedtuple('FolderItem', 'path name parent_path')):
+    __slots__ = ()
+    type = 'folder'
+
+class FileItem(collections.namedtuple('FileItem', 'path name parent_path full_path size modified_time')):
+    __slots__ = ()
+    type = 'file'
+
+class FolderScannedItem(collections.namedtuple('FolderScannedItem', 'path snapshot unchanged')):
+    __slots__ = ()
+    type = 'folder_scanned'
+
+def stat_threads_from_config(config):
+    """Returns `[Sync] stat_threads` from `config` (at least 1), or DEFAULT_STAT_THREADS if unset or invalid."""
+    try:
+        return max(1, config.getint('Sync', 'stat_threads', fallback=DEFAULT_STAT_THREADS))
+    except ValueError:
+        logger.warning(f"Invalid [Sync] stat_threads; using {DEFAULT_STAT_THREADS}.")
+        return DEFAULT_STAT_THREADS
+
+def _get_stat_executor(workers):
+    """Returns the shared stat pool, (re)creating it if it does not have `workers` threads."""
+    global _stat_executor, _stat_executor_workers
+    with _stat_executor_lock:
+        if _stat_executor_workers != workers:
+            if _stat_executor is not None:
+                _stat_executor.shutdown(wait=False)
+            _stat_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='drivesync-stat')
+            _stat_executor_workers = workers
+        return _stat_executor
+
+def _stat_entries(entries):
+    """Stats each DirEntry, returning its stat result or the exception raised, in order."""
+    results = []
+    for entry in entries:
+        try:
+            # Follows symlinks, like os.stat
+            results.append(entry.stat())
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _stat_files(files, stat_threads):
+    """
+    Yields the `_stat_entries` result of each file, in order.
+
+    With more than one thread the files are split into one contiguous slice per
+    thread, so network filesystems get `stat_threads` stats in flight while a
+    local disk pays only one task per slice rather than one per file.
+    """
+    if stat_threads <= 1 or len(files) < 2:
+        yield from _stat_entries(files)
+        return
+    size = -(-len(files) // stat_threads)
+    slices = [files[i:i + size] for i in range(0, len(files), size)]
+    for results in _get_stat_executor(stat_threads).map(_stat_entries, slices):
+        yield from results
+
+def _is_symlink(entry):
+    """Tells whether a DirEntry is a symlink; one that cannot be checked counts as one (as in os.walk)."""
+    try:
+        return entry.is_symlink()
+    except OSError:
+        return True
+
+def _dir_snapshot(dir_path):
+    """Returns (st_mtime_ns, st_ino) of a directory (path or open fd), or None if it cannot be stat'ed."""
+    try:
+        stat_info = os.stat(dir_path)
+    except OSError:
+        return None
+    return stat_info.st_mtime_ns, stat_info.st_ino
+
+def walk_local_directory(local_folder_path_str: str, stat_threads: int = 1, folder_snapshots=None):
     """
     Recursively traverses a local directory and yields information about
     each directory and file found.
 
     Args:
         local_folder_path_str (str): The absolute path to the local folder to traverse.
+        stat_threads (int): Number of threads stat'ing the files of each directory
+            (see `stat_threads_from_config`). Items are yielded in the same order
+            whatever the value; the folders of a directory come before its files.
+        folder_snapshots (dict, optional): {relative_path: (st_mtime_ns, st_ino)} of
+            folders ('.' for the top level) recorded by a previous run. When given,
+            each folder's snapshot is taken before it is listed; the files of a folder
+            whose snapshot is unchanged (no entry added, removed or renamed) are
+            neither stat'ed nor yielded, though its subfolders still are. Every
+            listed folder is then reported with a 'folder_scanned' item.
 
     Yields:
-        dict: A dictionary containing information about the found item.
-              For folders: {'type': 'folder', 'path': 'relative_path_str', 'name': 'folder_name'}
-              For files: {'type': 'file', 'path': 'relative_path_str', 'name': 'file_name',
-                          'full_path': 'absolute_path_str', 'size': file_size_in_bytes,
-                          'modified_time': last_modified_timestamp}
+        A namedtuple per found item, whose `type` is 'folder', 'file' or 'folder_scanned':
+              For folders: FolderItem(path='relative_path_str', name='folder_name',
+                                      parent_path='relative_parent_path_str')
+              For files: FileItem(path='relative_path_str', name='file_name',
+                                  parent_path='relative_parent_path_str',
+                                  full_path='absolute_path_str', size=file_size_in_bytes,
+                                  modified_time=last_modified_timestamp)
+              `parent_path` is the relative path of the containing folder ('.' for the
+              top level), i.e. `str(Path(path).parent)` without building a Path.
+              Only with `folder_snapshots`, after the files of each folder:
+              FolderScannedItem(path='relative_path_str', snapshot=(mtime_ns, inode),
+                                unchanged=bool), where `snapshot` is None if the folder
+              or one of its files could not be stat'ed.
     """
     base_path = Path(local_folder_path_str)
     if not base_path.is_dir():
         logger.error(f"Provided path '{local_folder_path_str}' is not a valid directory or does not exist.")
         return
 
-    logger.info(f"Starting to walk local directory: '{base_path}'")
+    logger.info("Starting to walk local directory: '%s'", base_path)
+    started = time.perf_counter()
+    folder_count = file_count = 0
 
-    # onerror=None is the default, it means os.walk will ignore errors from os.scandir()
-    # We will handle errors for individual items within the loop.
-    for root, dirs, files in os.walk(local_folder_path_str, topdown=True):
-        current_root_path = Path(root)
+    # Same order as a top-down os.walk: a directory's subfolders, then its files, then each
+    # subfolder's contents in turn. The traversal uses os.scandir directly, so classifying
+    # an entry needs no extra syscall (the dirent type is cached) and each file costs a single
+    # stat; relative paths are built by concatenation instead of Path.relative_to.
+    # Where supported, each directory is scanned through an open fd, so its entries are
+    # stat'ed with fstatat relative to it instead of re-resolving their absolute path.
+    pending = [(str(base_path), '')]  # (absolute directory path, relative path) still to scan
+    while pending:
+        dir_path, rel_dir = pending.pop()
+        dir_prefix = os.path.join(dir_path, '')
+        rel_prefix = rel_dir + os.sep if rel_dir else ''
+        parent_path = rel_dir or '.'
+        dir_fd = None
+        try:
+            if _SCANDIR_FD:
+                dir_fd = os.open(dir_path, _DIR_OPEN_FLAGS)
+            dir_ref = dir_path if dir_fd is None else dir_fd
+            snapshot = _dir_snapshot(dir_ref) if folder_snapshots is not None else None
+            with os.scandir(dir_ref) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            if dir_fd is not None:
+                os.close(dir_fd)
+            # os.walk silently skipped directories it could not list
+            logger.error(f"Error listing directory '{dir_path}': {e}. Skipping.")
+            continue
+        unchanged = snapshot is not None and folder_snapshots.get(parent_path) == snapshot
+
+        # Everything needing the directory fd (classifying, stat'ing) is done before yielding
+        try:
+            subdirs = []
+            files = []
+            for entry in entries:
+                try:
+                    # Follows symlinks, like os.walk: a link to a folder is reported as a folder
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (subdirs if is_dir else files).append(entry)
+            # Subfolders to descend into (not symlinked ones, as os.walk does by default),
+            # in reverse so the first one is scanned next
+            descend = [entry.name for entry in reversed(subdirs) if not _is_symlink(entry)]
+            # Files of an unchanged folder are all already in sync
+            if unchanged:
+                files = []
+            file_stats = list(_stat_files(files, stat_threads))
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
 
         # Process directories
-        # Sort for consistent order, which helps in testing and debugging
-        dirs.sort()
-        for dir_name in dirs:
-            full_dir_path = None  # Initialize for use in except block
-            try:
-                full_dir_path = current_root_path / dir_name
-                # Calculate path relative to the initial local_folder_path_str
-                relative_dir_path = full_dir_path.relative_to(base_path)
-
-                yield {
-                    'type': 'folder',
-                    'path': str(relative_dir_path), # Convert Path object to string
-                    'name': dir_name
-                }
-            except Exception as e:
-                logger.error(f"Error processing directory '{full_dir_path}': {e}. Skipping.")
-                # To prevent os.walk from descending into problematic directories after an error,
-                # one could remove it from `dirs` list here if `topdown=True`.
-                # However, os.walk's default behavior with onerror=None is to log and continue.
+        folder_count += len(subdirs)
+        for entry in subdirs:
+            yield FolderItem(rel_prefix + entry.name, entry.name, parent_path)
 
         # Process files
-        # Sort for consistent order
-        files.sort()
-        for file_name in files:
-            full_file_path = None  # Initialize for use in except block
+        for entry, stat_info in zip(files, file_stats):
+            full_path = dir_prefix + entry.name
+            if isinstance(stat_info, Exception):
+                snapshot = None  # Not every file was seen: the folder must be rescanned next time
+            if isinstance(stat_info, FileNotFoundError):
+                logger.error(f"File not found during processing: '{full_path}'. It might have been deleted post-scan. Skipping.")
+            elif isinstance(stat_info, PermissionError):
+                logger.error(f"Permission error accessing file: '{full_path}'. Skipping.")
+            elif isinstance(stat_info, Exception):
+                # Log other potential errors (e.g., from stat)
+                logger.error(f"Error processing file '{full_path}': {stat_info}. Skipping.")
+            else:
+                file_count += 1
+                yield FileItem(rel_prefix + entry.name, entry.name, parent_path,
+                               full_path, stat_info.st_size, stat_info.st_mtime)
+
+        if folder_snapshots is not None:
+            yield FolderScannedItem(parent_path, snapshot, unchanged)
+
+        for name in descend:
+            pending.append((dir_prefix + name, rel_prefix + name))
+
+    logger.info("Finished walking local directory: '%s' (%d folders, %d files in %.2f s)",
+                base_path, folder_count, file_count, time.perf_counter() - started)
+
+def walk_in_background(items, maxsize=WALK_QUEUE_SIZE):
+    """
+    Iterates `items` (normally a `walk_local_directory` generator) in a background
+    thread, yielding them in the same order through a bounded queue.
+
+    The walk (directory listings and stats on local disk) keeps going while the
+    consumer waits on Drive, running at most `maxsize` items ahead. An exception
+    raised by the walk is re-raised here after the items before it. If the
+    consumer stops early, the walk is stopped and closed as well.
+    """
+    buffer = queue.Queue(maxsize)
+    stopped = threading.Event()
+    failure = []
+
+    def put(item):
+        while not stopped.is_set():
             try:
-                full_file_path = current_root_path / file_name
-                relative_file_path = full_file_path.relative_to(base_path)
-
-                # Perform stat operations to get size and modified time
-                # Using full_file_path (Path object) directly with os.stat is fine in Python 3.6+
-                stat_info = os.stat(full_file_path)
-                file_size = stat_info.st_size
-                modified_time = stat_info.st_mtime
-
-                yield {
-                    'type': 'file',
-                    'path': str(relative_file_path), # Convert Path object to string
-                    'name': file_name,
-                    'full_path': str(full_file_path), # Convert Path object to string
-                    'size': file_size,
-                    'modified_time': modified_time
-                }
-            except FileNotFoundError:
-                logger.error(f"File not found during processing: '{full_file_path}'. It might have been deleted post-scan. Skipping.")
-            except PermissionError:
-                logger.error(f"Permission error accessing file: '{full_file_path}'. Skipping.")
-            except Exception as e:
-                # Log other potential errors (e.g., from os.stat)
-                logger.error(f"Error processing file '{full_file_path}': {e}. Skipping.")
-
-    logger.info(f"Finished walking local directory: '{base_path}'")
+                buffer.put(item, timeout=_WALK_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    break
+        except Exception as e:
+            failure.append(e)
+        finally:
+            if hasattr(items, 'close'):
+                items.close()
+            put(_WALK_DONE)
+
+    producer = threading.Thread(target=produce, name='drivesync-walk', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _WALK_DONE:
+                break
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+    if failure:
+        raise failure[0]
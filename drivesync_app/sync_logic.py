@@ -1,13 +1,104 @@
 """Módulo contendo a lógica principal de sincronização de arquivos e pastas."""
 
+import concurrent.futures
+import contextlib
 import logging
-from pathlib import Path
 from . import processador_arquivos
 from . import gerenciador_drive
-# from . import gerenciador_estado # State is passed in, direct use might be minimal
+from . import gerenciador_estado
 
 logger = logging.getLogger(__name__)
 
+# State changes (uploads, new folder mappings, ...) recorded between two checkpoint saves
+# of `app_state`, so an interrupted run keeps most of its progress
+STATE_CHECKPOINT_CHANGES = 500
+# Walked items between two INFO progress lines; per-item messages are logged at DEBUG
+PROGRESS_LOG_ITEMS = 1000
+
+def _content_unchanged(local_full_path, stored_item_info):
+    """
+    Returns True if the local file's MD5 equals the `drive_md5_checksum` recorded
+    when it was uploaded. Only called for files whose size matches but whose
+    modification time changed, so unchanged trees are never read.
+    """
+    stored_md5 = stored_item_info.get('drive_md5_checksum')
+    if not stored_md5:
+        return False
+    try:
+        return gerenciador_drive.local_md5(local_full_path) == stored_md5
+    except OSError as e:
+        logger.warning("Could not hash '%s' for change detection: %s", local_full_path, e)
+        return False
+
+def _record_upload(app_state, future, relative_item_path, current_local_size, current_local_modified_time):
+    """
+    Stores the outcome of a finished upload future (see `UploadPool.submit(with_md5=True)`)
+    in `app_state['processed_items']`. Returns True if the upload succeeded.
+    """
+    try:
+        new_drive_file_id, drive_md5_checksum = future.result()
+    except Exception as e:
+        logger.error("Unexpected error uploading '%s': %s", relative_item_path, e, exc_info=True)
+        new_drive_file_id = drive_md5_checksum = None
+
+    if new_drive_file_id:
+        logger.info("File '%s' uploaded/re-uploaded successfully. New Drive ID: %s", relative_item_path, new_drive_file_id)
+        # Update state with new Drive ID and current local metadata
+        app_state['processed_items'][relative_item_path] = {
+            'drive_id': new_drive_file_id,
+            'local_size': current_local_size,
+            'local_modified_time': current_local_modified_time,
+            'drive_md5_checksum': drive_md5_checksum
+        }
+        logger.debug("Updated state for '%s' with new Drive ID and local metadata.", relative_item_path)
+        return True
+    logger.error("Upload failed for '%s'. State not updated for this item.", relative_item_path)
+    return False
+
+def _record_finished_uploads(app_state, pending_uploads, done, failed_folders, recorded_paths):
+    """
+    Records each future in `done` and removes it from `pending_uploads`. The path of
+    each successful upload is added to `recorded_paths`, the folder of each failed
+    one to `failed_folders`.
+    """
+    for future in done:
+        parent_relative_path, relative_item_path, *upload = pending_uploads.pop(future)
+        if _record_upload(app_state, future, relative_item_path, *upload):
+            recorded_paths.add(relative_item_path)
+        else:
+            failed_folders.add(parent_relative_path)
+
+def _skip_unchanged_folders(config):
+    """Returns `[Sync] skip_unchanged_folders` (default False)."""
+    try:
+        return config.getboolean('Sync', 'skip_unchanged_folders', fallback=False)
+    except ValueError:
+        logger.warning("Invalid [Sync] skip_unchanged_folders; folders will not be skipped.")
+        return False
+
+def _with_sibling_folders_resolved(items, resolve_folders):
+    """
+    Passes the walker's items through, calling `resolve_folders(folders)` with each
+    run of sibling folders (the walker yields a folder's subfolders one after the
+    other) before any of them is yielded.
+    """
+    siblings = []
+    for item in items:
+        if item.type == 'folder' and (not siblings or siblings[0].parent_path == item.parent_path):
+            siblings.append(item)
+            continue
+        if siblings:
+            resolve_folders(siblings)
+            yield from siblings
+            siblings = []
+        if item.type == 'folder':
+            siblings.append(item)
+        else:
+            yield item
+    if siblings:
+        resolve_folders(siblings)
+        yield from siblings
+
 def run_sync(config, drive_service, app_state, dry_run=False):
     """
     Orchestrates the main synchronization logic between a local folder and Google Drive.
@@ -24,10 +115,28 @@ def run_sync(config, drive_service, app_state, dry_run=False):
         - If not, finding or creating the folder on Google Drive (unless `dry_run` is True).
         - Storing new folder mappings in `app_state` (if not `dry_run`).
         - Maintaining a temporary map (`local_to_drive_parent_map`) to find Drive parent IDs for children.
+          The walk yields the items of each folder together, so the map is read once per
+          folder and its entry dropped: it only holds folders still waiting to be scanned.
     - For each local file:
         - Comparing its current size and modification time against stored state in `app_state['processed_items']`.
-        - Uploading the file if it's new or changed (unless `dry_run` is True).
+          If only the modification time changed, the file is hashed and compared with the MD5
+          Drive reported for the last upload; matching content is not uploaded again.
+        - Uploading the file if it's new or changed (unless `dry_run` is True). Uploads run
+          concurrently on a `gerenciador_drive.UploadPool` (`[Upload] upload_concurrency`)
+          while the walk continues; folders are still created in walk order, since their
+          Drive IDs are the parents of the items below them.
         - Updating `app_state['processed_items']` with the Drive file ID and local metadata after successful upload (if not `dry_run`).
+          This happens on the calling thread as uploads finish, and all uploads have finished
+          when the function returns.
+    - Every `STATE_CHECKPOINT_CHANGES` state changes, `app_state` is saved with
+      `gerenciador_estado.save_state_changes` (one transaction holding only those rows), so
+      an interrupted run does not upload everything again (not in `dry_run`).
+    - With `[Sync] skip_unchanged_folders` enabled, the (mtime, inode) of every local folder
+      whose items were all in sync is stored in `app_state['folder_snapshots']`; on the next
+      run the files of a folder with the same snapshot (no entry added, removed or renamed)
+      are not stat'ed or checked. Edits made in place to existing files do not change their
+      folder's snapshot and are therefore NOT detected in such folders, which is why the
+      option is off by default.
     - If `dry_run` is True, all Drive operations (folder creation, file upload) and
       state modifications (`app_state`) are simulated and logged, but not actually performed.
 
@@ -79,107 +188,226 @@ def run_sync(config, drive_service, app_state, dry_run=False):
         logger.warning("'processed_items' not found in app_state, initializing.")
         app_state['processed_items'] = {}
 
+    # The whole state was read by load_state (one streamed SELECT per table) and is written back
+    # by save_state in bulk, so lookups below are plain dict lookups with no per-item SQL.
+    folder_mappings = app_state['folder_mappings']
+    processed_items = app_state['processed_items']
+    if not folder_mappings and not processed_items:
+        # A fresh state (e.g. its database was deleted to force a resync) must not trust
+        # folder IDs cached by earlier runs
+        logger.info("State is empty; clearing the Drive folder ID caches.")
+        gerenciador_drive.invalidate_folder_cache()
+
     local_to_drive_parent_map = {'.': target_drive_folder_id}
+    current_parent_path = None  # Folder whose items are being processed, and its Drive ID
+    drive_parent_id = None
+
+    # Folder snapshots (see _skip_unchanged_folders): those taken while walking, and the folders
+    # where some item failed, whose previous snapshot must not be replaced
+    skip_unchanged = _skip_unchanged_folders(config)
+    previous_snapshots = app_state.get('folder_snapshots') or {}
+    scanned_snapshots = {}
+    failed_folders = set()
+    # Paths changed since the last checkpoint, in processed_items and folder_mappings
+    changed_items = set()
+    changed_folders = set()
+    items_seen = files_unchanged = files_queued = 0  # For the periodic progress line
+
+    # Drive IDs of new folders looked up/created in one batch with their siblings
+    batched_folder_ids = {}
+    def resolve_folders(folders):
+        unmapped = [folder for folder in folders if folder.path not in folder_mappings]
+        parent_id = local_to_drive_parent_map.get(folders[0].parent_path)
+        if len(unmapped) < 2 or parent_id is None:
+            return  # A single folder costs the same through find_or_create_folder
+        folder_ids = gerenciador_drive.find_or_create_folders_batch(
+            drive_service, parent_id, [folder.name for folder in unmapped])
+        for folder in unmapped:
+            batched_folder_ids[folder.path] = folder_ids.get(folder.name)
+
+    # Steps that differ between real and dry runs are bound once, before the loop, instead of
+    # testing dry_run for every item
+    def add_folder_real(relative_item_path, item_name, drive_parent_id):
+        """Finds or creates the Drive folder of a new local folder and maps it. Returns its ID or None."""
+        drive_folder_id = batched_folder_ids.pop(relative_item_path, None)
+        if drive_folder_id is None:  # Not batched, or the batch could not resolve it
+            logger.debug("Attempting to find or create Drive folder for '%s' in parent Drive ID '%s'", item_name, drive_parent_id)
+            drive_folder_id = gerenciador_drive.find_or_create_folder(drive_service, drive_parent_id, item_name)
+        if drive_folder_id:
+            folder_mappings[relative_item_path] = drive_folder_id
+            changed_folders.add(relative_item_path)
+            logger.info("New folder mapping added: Local '%s' -> Drive ID '%s'", relative_item_path, drive_folder_id)
+        return drive_folder_id
+
+    def add_folder_dry(relative_item_path, item_name, drive_parent_id):
+        """Returns a simulated Drive ID for a new local folder."""
+        drive_folder_id = f"dry_run_folder_id_{relative_item_path.replace('/', '_')}"
+        logger.info("[Dry Run] Would attempt to find or create Drive folder for '%s'. Simulated ID: '%s'", item_name, drive_folder_id)
+        logger.info("[Dry Run] Would add folder mapping: Local '%s' -> Drive ID '%s'", relative_item_path, drive_folder_id)
+        return drive_folder_id
+
+    def queue_upload_real(item, drive_parent_id):
+        """Submits the upload of a walked file, waiting for one to finish if too many are in flight."""
+        logger.debug("Queueing upload of file '%s' to Drive parent ID '%s' as '%s'", item.full_path, drive_parent_id, item.name)
+        future = upload_pool.submit(
+            gerenciador_drive.UploadJob(item.full_path, item.name, drive_parent_id), with_md5=True)
+        pending_uploads[future] = (item.parent_path, item.path, item.size, item.modified_time)
+        if len(pending_uploads) >= max_pending_uploads:
+            done, _ = concurrent.futures.wait(
+                list(pending_uploads), return_when=concurrent.futures.FIRST_COMPLETED)
+            _record_finished_uploads(app_state, pending_uploads, done, failed_folders, changed_items)
+
+    def queue_upload_dry(item, drive_parent_id):
+        """Logs the upload a real run would make; `app_state['processed_items']` is not updated."""
+        new_drive_file_id = f"dry_run_file_id_{item.path.replace('/', '_')}" # Simulated ID
+        logger.info("[Dry Run] Would attempt to upload file '%s' as '%s' to Drive parent ID '%s'.", item.full_path, item.name, drive_parent_id)
+        logger.debug("[Dry Run] Simulated new Drive File ID would be '%s'.", new_drive_file_id)
+        logger.debug("[Dry Run] Would update state for '%s' with simulated Drive ID and local metadata (Size: %s, ModTime: %s).",
+                     item.path, item.size, item.modified_time)
+
+    def record_mtime_only_change_real(relative_item_path, stored_item_info, current_local_modified_time):
+        """Records the new modification time of a file whose content did not change."""
+        processed_items[relative_item_path] = dict(stored_item_info, local_modified_time=current_local_modified_time)
+        changed_items.add(relative_item_path)
+
+    def record_mtime_only_change_dry(relative_item_path, stored_item_info, current_local_modified_time):
+        """A dry run leaves the state untouched."""
+
+    if dry_run:
+        add_folder, queue_upload, record_mtime_only_change = (
+            add_folder_dry, queue_upload_dry, record_mtime_only_change_dry)
+    else:
+        add_folder, queue_upload, record_mtime_only_change = (
+            add_folder_real, queue_upload_real, record_mtime_only_change_real)
 
     logger.info(f"Starting processing of local directory: {source_folder_str}")
-    for item in processador_arquivos.walk_local_directory(source_folder_str):
-        relative_item_path = item['path']
-        item_name = item['name']
-        parent_relative_path = str(Path(relative_item_path).parent)
-        drive_parent_id = local_to_drive_parent_map.get(parent_relative_path)
-
-        if drive_parent_id is None:
-            logger.error(f"Parent Drive ID for '{relative_item_path}' (local parent: '{parent_relative_path}') not found. Skipping item. This may occur if parent folder processing failed.")
-            continue
+    # Uploads in flight: future -> (parent path, relative_item_path, local size, local mtime). Bounded so
+    # the walk runs at most a couple of uploads per worker ahead of the pool.
+    pending_uploads = {}
+    upload_pool_cm = contextlib.nullcontext() if dry_run else gerenciador_drive.UploadPool(drive_service)
+    with upload_pool_cm as upload_pool:
+        max_pending_uploads = 2 * upload_pool.max_workers if upload_pool is not None else 0
+        # The walk runs in its own thread, so local listing/stat'ing overlaps folder lookups and upload waits
+        items = processador_arquivos.walk_in_background(processador_arquivos.walk_local_directory(
+            source_folder_str, processador_arquivos.stat_threads_from_config(config),
+            previous_snapshots if skip_unchanged else None))
+        if not dry_run:
+            items = _with_sibling_folders_resolved(items, resolve_folders)
+        for item in items:
+            if len(changed_items) + len(changed_folders) >= STATE_CHECKPOINT_CHANGES:
+                # Only the rows changed since the last checkpoint are written
+                logger.info("Checkpoint: saving %d state changes.", len(changed_items) + len(changed_folders))
+                if not gerenciador_estado.save_state_changes(config, app_state, changed_items, changed_folders):
+                    logger.warning("Checkpoint save of the state failed; it will be saved again at the end of the run.")
+                changed_items.clear()
+                changed_folders.clear()
+
+            if item.type == 'folder_scanned':
+                if item.unchanged:
+                    logger.debug("Folder '%s' is unchanged since the last sync. Skipping its files.", item.path)
+                if item.snapshot is not None:
+                    scanned_snapshots[item.path] = item.snapshot
+                continue
+
+            items_seen += 1
+            if items_seen % PROGRESS_LOG_ITEMS == 0:
+                logger.info("Progress: %d items processed (%d unchanged files, %d files queued for upload).",
+                            items_seen, files_unchanged, files_queued)
 
-        # --- Folder Processing ---
-        if item['type'] == 'folder':
-            logger.info(f"Processing folder: '{relative_item_path}' (Local Name: '{item_name}')")
-            drive_folder_id = None
-            if relative_item_path in app_state['folder_mappings']:
-                drive_folder_id = app_state['folder_mappings'][relative_item_path]
-                logger.info(f"Folder mapping already exists for '{relative_item_path}'. Drive ID: '{drive_folder_id}'")
-            else:
-                if not dry_run:
-                    logger.info(f"Attempting to find or create Drive folder for '{item_name}' in parent Drive ID '{drive_parent_id}'")
-                    drive_folder_id = gerenciador_drive.find_or_create_folder(drive_service, drive_parent_id, item_name)
+            relative_item_path = item.path
+            item_name = item.name
+            parent_relative_path = item.parent_path
+            if parent_relative_path != current_parent_path:
+                current_parent_path = parent_relative_path
+                drive_parent_id = local_to_drive_parent_map.pop(parent_relative_path, None)
+
+            if drive_parent_id is None:
+                failed_folders.add(parent_relative_path)
+                logger.error("Parent Drive ID for '%s' (local parent: '%s') not found. Skipping item. This may occur if parent folder processing failed.",
+                             relative_item_path, parent_relative_path)
+                continue
+
+            # --- Folder Processing ---
+            if item.type == 'folder':
+                logger.debug("Processing folder: '%s' (Local Name: '%s')", relative_item_path, item_name)
+                drive_folder_id = folder_mappings.get(relative_item_path)
+                if drive_folder_id is not None:
+                    logger.debug("Folder mapping already exists for '%s'. Drive ID: '%s'", relative_item_path, drive_folder_id)
                 else:
-                    drive_folder_id = f"dry_run_folder_id_{relative_item_path.replace('/', '_')}"
-                    logger.info(f"[Dry Run] Would attempt to find or create Drive folder for '{item_name}'. Simulated ID: '{drive_folder_id}'")
-
-            if drive_folder_id:
-                if relative_item_path not in app_state['folder_mappings']:
-                    if not dry_run:
-                        app_state['folder_mappings'][relative_item_path] = drive_folder_id
-                        logger.info(f"New folder mapping added: Local '{relative_item_path}' -> Drive ID '{drive_folder_id}'")
-                    else:
-                        logger.info(f"[Dry Run] Would add folder mapping: Local '{relative_item_path}' -> Drive ID '{drive_folder_id}'")
-                # Always update local_to_drive_parent_map for the current session, even in dry_run, to allow child processing
-                local_to_drive_parent_map[relative_item_path] = drive_folder_id
-                logger.debug(f"Updated local_to_drive_parent_map: '{relative_item_path}' -> '{drive_folder_id}' (Dry run: {dry_run})")
-            else:
-                logger.error(f"Failed to find or create Drive folder for '{relative_item_path}' (Name: '{item_name}'). Items under this folder may be skipped or affected.")
-
-        # --- File Processing ---
-        elif item['type'] == 'file':
-            logger.info(f"Processing file: '{relative_item_path}' (Local Name: '{item_name}')")
-            current_local_size = item['size']
-            current_local_modified_time = item['modified_time']
-            needs_upload = True # Assume upload is needed unless state check proves otherwise
-
-            # Check if the file is already in processed_items and if it has changed
-            if relative_item_path in app_state['processed_items']:
-                stored_item_info = app_state['processed_items'][relative_item_path]
-                stored_size = stored_item_info.get('local_size')
-                stored_modified_time = stored_item_info.get('local_modified_time')
-                drive_id = stored_item_info.get('drive_id') # For logging purposes
-
-                # Condition for skipping: if size and modified time match stored values
-                if stored_size == current_local_size and stored_modified_time == current_local_modified_time:
-                    logger.info(f"File '{relative_item_path}' is already synced and unchanged. Skipping. Drive ID: {drive_id}")
-                    needs_upload = False
+                    drive_folder_id = add_folder(relative_item_path, item_name, drive_parent_id)
+
+                if drive_folder_id:
+                    # Always update local_to_drive_parent_map for the current session, even in dry_run, to allow child processing
+                    local_to_drive_parent_map[relative_item_path] = drive_folder_id
+                    logger.debug("Updated local_to_drive_parent_map: '%s' -> '%s' (Dry run: %s)", relative_item_path, drive_folder_id, dry_run)
                 else:
-                    # Condition for re-upload: if size or modified time differs
-                    logger.info(f"File '{relative_item_path}' has changed (Size: {stored_size} -> {current_local_size}, ModTime: {stored_modified_time} -> {current_local_modified_time}). Marked for re-upload. Old Drive ID: {drive_id}")
-            else:
-                # Condition for new file: if not in processed_items
-                logger.info(f"File '{relative_item_path}' is new. Preparing for upload.")
-
-            # Proceed with upload if needed
-            if needs_upload:
-                local_full_path = item['full_path']
-                # item_name is already defined above
-                # item_name is already defined above
-                # drive_parent_id is already defined above
-
-                if drive_parent_id:
-                    if not dry_run:
-                        # --- Actual Upload ---
-                        logger.info(f"Attempting to upload file '{local_full_path}' to Drive parent ID '{drive_parent_id}' as '{item_name}'")
-                        new_drive_file_id = gerenciador_drive.upload_file(drive_service, local_full_path, item_name, drive_parent_id)
-
-                        if new_drive_file_id:
-                            logger.info(f"File '{relative_item_path}' uploaded/re-uploaded successfully. New Drive ID: {new_drive_file_id}")
-                            # Update state with new Drive ID and current local metadata
-                            app_state['processed_items'][relative_item_path] = {
-                                'drive_id': new_drive_file_id,
-                                'local_size': current_local_size,
-                                'local_modified_time': current_local_modified_time
-                            }
-                            logger.info(f"Updated state for '{relative_item_path}' with new Drive ID and local metadata.")
-                        else:
-                            logger.error(f"Upload failed for '{relative_item_path}'. State not updated for this item.")
+                    failed_folders.add(parent_relative_path)
+                    logger.error("Failed to find or create Drive folder for '%s' (Name: '%s'). Items under this folder may be skipped or affected.",
+                                 relative_item_path, item_name)
+
+            # --- File Processing ---
+            elif item.type == 'file':
+                logger.debug("Processing file: '%s' (Local Name: '%s')", relative_item_path, item_name)
+                current_local_size = item.size
+                current_local_modified_time = item.modified_time
+                needs_upload = True # Assume upload is needed unless state check proves otherwise
+
+                # Check if the file is already in processed_items and if it has changed
+                stored_item_info = processed_items.get(relative_item_path)
+                if stored_item_info is not None:
+                    stored_size = stored_item_info.get('local_size')
+                    stored_modified_time = stored_item_info.get('local_modified_time')
+                    drive_id = stored_item_info.get('drive_id') # For logging purposes
+
+                    # Condition for skipping: if size and modified time match stored values
+                    if stored_size == current_local_size and stored_modified_time == current_local_modified_time:
+                        logger.debug("File '%s' is already synced and unchanged. Skipping. Drive ID: %s", relative_item_path, drive_id)
+                        needs_upload = False
+                        files_unchanged += 1
+                    elif stored_size == current_local_size and _content_unchanged(item.full_path, stored_item_info):
+                        # Only the modification time moved (touched, restored from backup, ...):
+                        # the content still matches the uploaded copy, so just record the new time
+                        logger.debug("File '%s' has a new modification time but unchanged content. Skipping upload. Drive ID: %s", relative_item_path, drive_id)
+                        needs_upload = False
+                        files_unchanged += 1
+                        record_mtime_only_change(relative_item_path, stored_item_info, current_local_modified_time)
                     else:
-                        # --- Dry Run: Simulate Upload ---
-                        new_drive_file_id = f"dry_run_file_id_{relative_item_path.replace('/', '_')}" # Simulated ID
-                        logger.info(f"[Dry Run] Would attempt to upload file '{local_full_path}' as '{item_name}' to Drive parent ID '{drive_parent_id}'.")
-                        logger.info(f"[Dry Run] Simulated new Drive File ID would be '{new_drive_file_id}'.")
-                        # Do not update app_state['processed_items'] in dry run
-                        logger.info(f"[Dry Run] Would update state for '{relative_item_path}' with simulated Drive ID and local metadata (Size: {current_local_size}, ModTime: {current_local_modified_time}).")
+                        # Condition for re-upload: if size or modified time differs
+                        logger.info("File '%s' has changed (Size: %s -> %s, ModTime: %s -> %s). Marked for re-upload. Old Drive ID: %s",
+                                    relative_item_path, stored_size, current_local_size,
+                                    stored_modified_time, current_local_modified_time, drive_id)
                 else:
-                    # This case should ideally be rare if parent folder processing is robust
-                    logger.error(f"Cannot upload file '{relative_item_path}' because its parent Drive folder ID could not be determined. Skipping.")
-            # If needs_upload is False, it means the file was found in state and deemed unchanged, already logged.
+                    # Condition for new file: if not in processed_items
+                    logger.debug("File '%s' is new. Preparing for upload.", relative_item_path)
+
+                # Proceed with upload if needed
+                if needs_upload:
+                    if drive_parent_id:
+                        files_queued += 1
+                        queue_upload(item, drive_parent_id)
+                    else:
+                        # This case should ideally be rare if parent folder processing is robust
+                        failed_folders.add(parent_relative_path)
+                        logger.error("Cannot upload file '%s' because its parent Drive folder ID could not be determined. Skipping.", relative_item_path)
+                # If needs_upload is False, it means the file was found in state and deemed unchanged, already logged.
+
+        # Wait for the remaining uploads
+        _record_finished_uploads(app_state, pending_uploads,
+                                 concurrent.futures.as_completed(list(pending_uploads)), failed_folders, changed_items)
+
+    if not dry_run:
+        if skip_unchanged:
+            # Folders no longer present locally are dropped; failed ones keep their previous snapshot
+            app_state['folder_snapshots'] = {
+                path: (previous_snapshots.get(path) if path in failed_folders else snapshot)
+                for path, snapshot in scanned_snapshots.items()
+                if path not in failed_folders or path in previous_snapshots
+            }
+        elif previous_snapshots:
+            # Snapshots are only trustworthy if every run maintains them
+            app_state['folder_snapshots'] = {}
 
-    logger.info(f"Completed processing loop for source folder: {source_folder_str} (Dry run: {dry_run}).")
+    logger.info("Completed processing loop for source folder: %s (Dry run: %s). %d items processed, %d unchanged files, %d files %s.",
+                source_folder_str, dry_run, items_seen, files_unchanged, files_queued,
+                "that would be uploaded" if dry_run else "queued for upload")
     logger.info("Synchronization process run_sync function call completed.")
@@ -1,9 +1,70 @@
 """Módulo para verificar a consistência da sincronização entre arquivos locais, estado e Google Drive."""
 
 import logging
+from drivesync_app import gerenciador_drive # Batched metadata lookups
 from drivesync_app import processador_arquivos # To iterate through local files
 from googleapiclient.errors import HttpError # To handle Drive API errors
 
+# Partial-response fields fetched for each verified file
+VERIFY_FIELDS = 'id,name,size,trashed'
+
+def _check_drive_files(drive_service, pending, logger):
+    """
+    Fetches the Drive metadata of a group of state files in batched requests and checks each one.
+
+    Args:
+        pending (list): (relative_path, drive_id, local_size) tuples.
+
+    Returns:
+        tuple: (mismatch count, missing or trashed count).
+    """
+    mismatch_files_count = 0
+    drive_missing_or_trashed_files_count = 0
+    metadata_by_id = gerenciador_drive.get_file_metadata_batch(
+        drive_service, [drive_id for _, drive_id, _ in pending], fields=VERIFY_FIELDS)
+    for relative_path, drive_id, local_size in pending:
+        logger.debug(f"Verifying file '{relative_path}' (Drive ID: {drive_id}) on Google Drive.")
+        drive_file_metadata = metadata_by_id.get(drive_id)
+        if isinstance(drive_file_metadata, HttpError):
+            e = drive_file_metadata
+            if e.resp.status == 404:
+                logger.error(f"File '{relative_path}' (Drive ID: {drive_id}) found in state but MISSING on Google Drive (404 Not Found).")
+                drive_missing_or_trashed_files_count += 1
+            else:
+                logger.error(f"API Error verifying file '{relative_path}' (Drive ID: {drive_id}): {e}")
+                mismatch_files_count += 1 # Count as a mismatch due to API error during check
+            continue
+        if isinstance(drive_file_metadata, Exception) or drive_file_metadata is None:
+            logger.error(f"Unexpected error verifying file '{relative_path}' (Drive ID: {drive_id}) on Drive: {drive_file_metadata}")
+            mismatch_files_count += 1 # Count as a mismatch due to unexpected error
+            continue
+
+        if drive_file_metadata.get('trashed', False):
+            logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}) is in the TRASH on Google Drive.")
+            drive_missing_or_trashed_files_count +=1
+        else:
+            drive_size_str = drive_file_metadata.get('size')
+            if drive_size_str is not None:
+                try:
+                    drive_size_int = int(drive_size_str) # Drive API returns size as string
+                    if local_size == drive_size_int:
+                        logger.info(f"File '{relative_path}' (Drive ID: {drive_id}): Local size ({local_size}) matches Drive size ({drive_size_int}). OK.")
+                    else:
+                        logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}): SIZE MISMATCH. Local: {local_size}, Drive: {drive_size_int}.")
+                        mismatch_files_count += 1
+                except ValueError:
+                    logger.error(f"File '{relative_path}' (Drive ID: {drive_id}): Could not convert Drive size '{drive_size_str}' to integer.")
+                    mismatch_files_count += 1
+            else:
+                # This case is unusual for regular files on Drive, might indicate a Google Doc or folder
+                # Google Docs, Sheets, Slides etc., do not have a 'size' field in the same way.
+                # Their mimeType would be 'application/vnd.google-apps.document', etc.
+                # For this verification, we assume files being synced are expected to have a byte size.
+                logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}): No size information returned from Drive. (Is it a Google Workspace document type?). Local size: {local_size}.")
+                # Consider if this should be a mismatch. For now, treating as a warning.
+                # If it's a Google Doc, it shouldn't have been processed as a regular file with size in `processed_items` anyway.
+    return mismatch_files_count, drive_missing_or_trashed_files_count
+
 def verify_sync(config, drive_service, current_state, logger_instance):
     """
     Verifies the consistency of synchronized files between the local source,
@@ -11,7 +72,8 @@ def verify_sync(config, drive_service, current_state, logger_instance):
 
     It iterates through local files in the `source_folder` (defined in `config`):
     1.  Checks if each local file is recorded in `current_state['processed_items']`.
-    2.  If recorded, retrieves the Google Drive file ID and fetches its metadata from Drive.
+    2.  If recorded, retrieves the Google Drive file ID and fetches its metadata from Drive
+        (in batched requests of up to `gerenciador_drive.DRIVE_BATCH_LIMIT` files).
     3.  Compares the local file's size with the size reported by Google Drive.
     4.  Checks if the file on Google Drive is marked as 'trashed'.
     5.  Logs discrepancies, such as:
@@ -51,12 +113,15 @@ def verify_sync(config, drive_service, current_state, logger_instance):
     mismatch_files_count = 0
     local_only_files_count = 0
     drive_missing_or_trashed_files_count = 0 # Combined counter
+    # (relative_path, drive_id, local_size) of files checked on Drive in the next batch
+    pending = []
 
-    for item in processador_arquivos.walk_local_directory(source_folder):
-        if item['type'] == 'file':
+    for item in processador_arquivos.walk_local_directory(
+            source_folder, processador_arquivos.stat_threads_from_config(config)):
+        if item.type == 'file':
             verified_files_count += 1
-            relative_path = item['path']
-            local_size = item['size'] # This is an integer
+            relative_path = item.path
+            local_size = item.size # This is an integer
 
             if relative_path in current_state.get('processed_items', {}):
                 stored_info = current_state['processed_items'][relative_path]
@@ -69,54 +134,22 @@ def verify_sync(config, drive_service, current_state, logger_instance):
                     mismatch_files_count +=1 # Count as a mismatch/inconsistency
                     continue
 
-                try:
-                    logger.debug(f"Verifying file '{relative_path}' (Drive ID: {drive_id}) on Google Drive.")
-                    # Request 'size' (string) and 'trashed' (boolean) fields
-                    drive_file_metadata = drive_service.files().get(
-                        fileId=drive_id,
-                        fields='id,name,size,trashed'
-                    ).execute()
-
-                    if drive_file_metadata.get('trashed', False):
-                        logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}) is in the TRASH on Google Drive.")
-                        drive_missing_or_trashed_files_count +=1
-                    else:
-                        drive_size_str = drive_file_metadata.get('size')
-                        if drive_size_str is not None:
-                            try:
-                                drive_size_int = int(drive_size_str) # Drive API returns size as string
-                                if local_size == drive_size_int:
-                                    logger.info(f"File '{relative_path}' (Drive ID: {drive_id}): Local size ({local_size}) matches Drive size ({drive_size_int}). OK.")
-                                else:
-                                    logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}): SIZE MISMATCH. Local: {local_size}, Drive: {drive_size_int}.")
-                                    mismatch_files_count += 1
-                            except ValueError:
-                                logger.error(f"File '{relative_path}' (Drive ID: {drive_id}): Could not convert Drive size '{drive_size_str}' to integer.")
-                                mismatch_files_count += 1
-                        else:
-                            # This case is unusual for regular files on Drive, might indicate a Google Doc or folder
-                            # Google Docs, Sheets, Slides etc., do not have a 'size' field in the same way.
-                            # Their mimeType would be 'application/vnd.google-apps.document', etc.
-                            # For this verification, we assume files being synced are expected to have a byte size.
-                            logger.warning(f"File '{relative_path}' (Drive ID: {drive_id}): No size information returned from Drive. (Is it a Google Workspace document type?). Local size: {local_size}.")
-                            # Consider if this should be a mismatch. For now, treating as a warning.
-                            # If it's a Google Doc, it shouldn't have been processed as a regular file with size in `processed_items` anyway.
-
-                except HttpError as e:
-                    if e.resp.status == 404:
-                        logger.error(f"File '{relative_path}' (Drive ID: {drive_id}) found in state but MISSING on Google Drive (404 Not Found).")
-                        drive_missing_or_trashed_files_count += 1
-                    else:
-                        logger.error(f"API Error verifying file '{relative_path}' (Drive ID: {drive_id}): {e}")
-                        mismatch_files_count += 1 # Count as a mismatch due to API error during check
-                except Exception as e:
-                    logger.error(f"Unexpected error verifying file '{relative_path}' (Drive ID: {drive_id}) on Drive: {e}")
-                    mismatch_files_count += 1 # Count as a mismatch due to unexpected error
+                pending.append((relative_path, drive_id, local_size))
+                if len(pending) >= gerenciador_drive.DRIVE_BATCH_LIMIT:
+                    mismatches, missing = _check_drive_files(drive_service, pending, logger)
+                    mismatch_files_count += mismatches
+                    drive_missing_or_trashed_files_count += missing
+                    pending = []
 
             else: # file not in processed_items
                 logger.warning(f"Local file '{relative_path}' NOT FOUND in sync state (processed_items).")
                 local_only_files_count += 1
 
+    if pending:
+        mismatches, missing = _check_drive_files(drive_service, pending, logger)
+        mismatch_files_count += mismatches
+        drive_missing_or_trashed_files_count += missing
+
     logger.info(f"Verification Summary --- Total local files processed: {verified_files_count}")
     logger.info(f"  - Size mismatches or Drive access issues: {mismatch_files_count}")
     logger.info(f"  - Local files not found in state: {local_only_files_count}")